@@ -9,16 +9,10 @@ import sys
 from pathlib import Path
 
 # Allow running from repo root without installing package
-sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
-
-from PySide6.QtWidgets import QApplication, QMainWindow
-
-from abc_music_manager.app_icon import application_icon
-from abc_music_manager.services.app_state import AppState
-from abc_music_manager.services.preferences import ensure_default_lotro_root
-from abc_music_manager.ui.theme import apply_theme
-from abc_music_manager.ui.main_window import MainWindow
-
+_HERE = Path(__file__).resolve().parent
+_SRC = str(_HERE / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="ABC Music Manager")
@@ -29,6 +23,15 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    # Qt and the ui package are imported only after argument parsing so --help
+    # (and anything importing this module headless) never pays the Qt import cost.
+    from PySide6.QtWidgets import QApplication, QMainWindow
+
+    from abc_music_manager.app_icon import application_icon
+    from abc_music_manager.services.app_state import AppState
+    from abc_music_manager.services.preferences import ensure_default_lotro_root
+    from abc_music_manager.ui.theme import apply_theme
+
     if args.assistant:
         app = QApplication(sys.argv)
         app.setApplicationName("ABC Band Assistant")
@@ -48,6 +51,8 @@ def main() -> None:
         window.show()
         sys.exit(app.exec())
 
+    from abc_music_manager.ui.main_window import MainWindow
+
     app = QApplication(sys.argv)
     app.setApplicationName("ABC Music Manager")
     icon = application_icon()
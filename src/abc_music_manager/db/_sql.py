@@ -0,0 +1,34 @@
+"""
+Shared SQL-building helper for the db repos.
+
+The partial-update functions (update_setlist, update_status, ...) accept a mix
+of optional fields and used to string-join a fresh UPDATE statement per call.
+Memoizing the statement per (table, field set) makes repeat calls O(1) in
+Python and keeps the SQL text byte-identical, so sqlite3's prepared-statement
+cache is hit instead of re-compiling the statement.
+"""
+
+from __future__ import annotations
+
+import functools
+import sqlite3
+
+# INSERT ... RETURNING needs SQLite >= 3.35 (2021); older builds fall back to
+# lastrowid, which costs a second VDBE run for the implicit rowid fetch.
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def insert_returning_id(conn: sqlite3.Connection, sql: str, params: tuple | list) -> int:
+    """Execute an INSERT and return the new row id, via RETURNING id when available."""
+    if HAS_RETURNING:
+        cur = conn.execute(sql + " RETURNING id", params)
+        return cur.fetchone()[0]
+    cur = conn.execute(sql, params)
+    return cur.lastrowid
+
+
+@functools.lru_cache(maxsize=None)
+def update_sql(table: str, columns: tuple[str, ...]) -> str:
+    """Return 'UPDATE {table} SET col = ?, ... WHERE id = ?' for the given columns."""
+    assignments = ", ".join(f"{col} = ?" for col in columns)
+    return f"UPDATE {table} SET {assignments} WHERE id = ?"
@@ -0,0 +1,18 @@
+"""
+Shared timestamp helper for the db repos.
+
+Every repo module used to define its own `_now()`; they all meant the same
+thing, so the helper lives here once. The timezone object is bound at import
+time to keep the per-write cost to a single datetime allocation + format.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+_UTC = timezone.utc
+
+
+def now_iso() -> str:
+    """Current UTC time as ISO 8601 (what datetime.now(timezone.utc).isoformat() returns)."""
+    return datetime.now(_UTC).isoformat()
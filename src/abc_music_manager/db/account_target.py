@@ -4,14 +4,11 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-@dataclass
+@dataclass(slots=True)
 class AccountTargetRow:
     id: int
     account_name: str
@@ -21,10 +18,14 @@ class AccountTargetRow:
     updated_at: str
 
 
+_SQL_LIST_TARGETS = (
+    "SELECT id, account_name, plugin_data_path, enabled, created_at, updated_at"
+    " FROM AccountTarget ORDER BY account_name"
+)
+
+
 def list_account_targets(conn: sqlite3.Connection) -> list[AccountTargetRow]:
-    cur = conn.execute(
-        "SELECT id, account_name, plugin_data_path, enabled, created_at, updated_at FROM AccountTarget ORDER BY account_name"
-    )
+    cur = conn.execute(_SQL_LIST_TARGETS)
     return [
         AccountTargetRow(
             id=r[0],
@@ -34,7 +35,7 @@ def list_account_targets(conn: sqlite3.Connection) -> list[AccountTargetRow]:
             created_at=r[4],
             updated_at=r[5],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -50,7 +51,7 @@ def add_account_target(
            VALUES (?, ?, ?, ?, ?)""",
         (account_name.strip(), plugin_data_path.strip(), 1 if enabled else 0, now, now),
     )
-    conn.commit()
+    maybe_commit(conn)
     return cur.lastrowid
 
 
@@ -62,26 +63,25 @@ def update_account_target(
     plugin_data_path: str | None = None,
     enabled: bool | None = None,
 ) -> None:
-    updates = []
-    args = []
-    if account_name is not None:
-        updates.append("account_name = ?")
-        args.append(account_name.strip())
-    if plugin_data_path is not None:
-        updates.append("plugin_data_path = ?")
-        args.append(plugin_data_path.strip())
-    if enabled is not None:
-        updates.append("enabled = ?")
-        args.append(1 if enabled else 0)
-    if not updates:
+    if account_name is None and plugin_data_path is None and enabled is None:
         return
-    updates.append("updated_at = ?")
-    args.append(_now())
-    args.append(target_id)
-    conn.execute(f"UPDATE AccountTarget SET {', '.join(updates)} WHERE id = ?", args)
-    conn.commit()
+    # Fixed SQL shape (COALESCE keeps untouched fields) so sqlite3's statement
+    # cache hits instead of reparsing a per-combination dynamic string.
+    conn.execute(
+        """UPDATE AccountTarget SET account_name = COALESCE(?, account_name),
+           plugin_data_path = COALESCE(?, plugin_data_path),
+           enabled = COALESCE(?, enabled), updated_at = ? WHERE id = ?""",
+        (
+            account_name.strip() if account_name is not None else None,
+            plugin_data_path.strip() if plugin_data_path is not None else None,
+            None if enabled is None else (1 if enabled else 0),
+            _now(),
+            target_id,
+        ),
+    )
+    maybe_commit(conn)
 
 
 def delete_account_target(conn: sqlite3.Connection, target_id: int) -> None:
     conn.execute("DELETE FROM AccountTarget WHERE id = ?", (target_id,))
-    conn.commit()
+    maybe_commit(conn)
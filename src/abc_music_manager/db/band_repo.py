@@ -5,14 +5,11 @@ from __future__ import annotations
 import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-@dataclass
+@dataclass(slots=True)
 class BandRow:
     id: int
     name: str
@@ -21,7 +18,7 @@ class BandRow:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BandLayoutRow:
     id: int
     band_id: int
@@ -30,7 +27,7 @@ class BandLayoutRow:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BandLayoutSlotRow:
     id: int
     band_layout_id: int
@@ -47,7 +44,7 @@ def list_bands(conn: sqlite3.Connection) -> list[BandRow]:
     cur = conn.execute(
         "SELECT id, name, created_at, updated_at, notes FROM Band ORDER BY sort_order, name"
     )
-    return [BandRow(id=r[0], name=r[1], notes=r[4], created_at=r[2], updated_at=r[3]) for r in cur.fetchall()]
+    return [BandRow(id=r[0], name=r[1], notes=r[4], created_at=r[2], updated_at=r[3]) for r in cur]
 
 
 def add_band(conn: sqlite3.Connection, name: str, notes: str | None = None) -> int:
@@ -58,7 +55,7 @@ def add_band(conn: sqlite3.Connection, name: str, notes: str | None = None) -> i
         "INSERT INTO Band (name, notes, sort_order, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
         (name.strip(), notes or None, sort_order, now, now),
     )
-    conn.commit()
+    maybe_commit(conn)
     return cur.lastrowid
 
 
@@ -70,7 +67,7 @@ def reorder_bands(conn: sqlite3.Connection, band_ids_in_order: list[int]) -> Non
             "UPDATE Band SET sort_order = ?, updated_at = ? WHERE id = ?",
             (sort_order, now, band_id),
         )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def duplicate_band(conn: sqlite3.Connection, band_id: int) -> int:
@@ -114,31 +111,29 @@ def update_band(
         )
     else:
         conn.execute("UPDATE Band SET name = ?, updated_at = ? WHERE id = ?", (name.strip(), now, band_id))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def delete_band(conn: sqlite3.Connection, band_id: int) -> None:
-    conn.execute("DELETE FROM BandLayoutSlot WHERE band_layout_id IN (SELECT id FROM BandLayout WHERE band_id = ?)", (band_id,))
-    conn.execute("DELETE FROM BandLayout WHERE band_id = ?", (band_id,))
-    conn.execute("DELETE FROM BandMember WHERE band_id = ?", (band_id,))
+    # BandLayout/BandLayoutSlot/BandMember cascade (schema migration 16).
     conn.execute("DELETE FROM Band WHERE id = ?", (band_id,))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def list_band_members(conn: sqlite3.Connection, band_id: int) -> list[int]:
     """Return list of player_ids in this band."""
     cur = conn.execute("SELECT player_id FROM BandMember WHERE band_id = ? ORDER BY player_id", (band_id,))
-    return [r[0] for r in cur.fetchall()]
+    return [r[0] for r in cur]
 
 
 def add_band_member(conn: sqlite3.Connection, band_id: int, player_id: int) -> None:
     conn.execute("INSERT OR IGNORE INTO BandMember (band_id, player_id) VALUES (?, ?)", (band_id, player_id))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def remove_band_member(conn: sqlite3.Connection, band_id: int, player_id: int) -> None:
     conn.execute("DELETE FROM BandMember WHERE band_id = ? AND player_id = ?", (band_id, player_id))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def list_all_band_layouts(conn: sqlite3.Connection) -> list[tuple[int, str, str]]:
@@ -147,7 +142,7 @@ def list_all_band_layouts(conn: sqlite3.Connection) -> list[tuple[int, str, str]
         """SELECT bl.id, bl.name, b.name FROM BandLayout bl JOIN Band b ON b.id = bl.band_id
            ORDER BY b.name, bl.sort_order, bl.id"""
     )
-    return [(r[0], r[1], r[2]) for r in cur.fetchall()]
+    return [(r[0], r[1], r[2]) for r in cur]
 
 
 def get_band_layout_display_name(conn: sqlite3.Connection, band_layout_id: int | None) -> str:
@@ -165,7 +160,7 @@ def list_band_layouts(conn: sqlite3.Connection, band_id: int) -> list[BandLayout
         "SELECT id, band_id, name, created_at, updated_at FROM BandLayout WHERE band_id = ? ORDER BY sort_order, id",
         (band_id,),
     )
-    return [BandLayoutRow(id=r[0], band_id=r[1], name=r[2], created_at=r[3], updated_at=r[4]) for r in cur.fetchall()]
+    return [BandLayoutRow(id=r[0], band_id=r[1], name=r[2], created_at=r[3], updated_at=r[4]) for r in cur]
 
 
 def add_band_layout(conn: sqlite3.Connection, band_id: int, name: str) -> int:
@@ -179,19 +174,19 @@ def add_band_layout(conn: sqlite3.Connection, band_id: int, name: str) -> int:
         "INSERT INTO BandLayout (band_id, name, sort_order, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
         (band_id, name.strip(), sort_order, now, now),
     )
-    conn.commit()
+    maybe_commit(conn)
     return cur.lastrowid
 
 
 def update_band_layout(conn: sqlite3.Connection, layout_id: int, name: str) -> None:
     conn.execute("UPDATE BandLayout SET name = ?, updated_at = ? WHERE id = ?", (name.strip(), _now(), layout_id))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def delete_band_layout(conn: sqlite3.Connection, layout_id: int) -> None:
-    conn.execute("DELETE FROM BandLayoutSlot WHERE band_layout_id = ?", (layout_id,))
+    # BandLayoutSlot rows cascade (schema migration 16).
     conn.execute("DELETE FROM BandLayout WHERE id = ?", (layout_id,))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def reorder_band_layouts(conn: sqlite3.Connection, band_id: int, layout_ids_in_order: list[int]) -> None:
@@ -202,7 +197,7 @@ def reorder_band_layouts(conn: sqlite3.Connection, band_id: int, layout_ids_in_o
             "UPDATE BandLayout SET sort_order = ?, updated_at = ? WHERE id = ? AND band_id = ?",
             (sort_order, now, layout_id, band_id),
         )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def duplicate_band_layout(conn: sqlite3.Connection, layout_id: int, name: str | None = None) -> int:
@@ -230,7 +225,7 @@ def duplicate_band_layout(conn: sqlite3.Connection, layout_id: int, name: str |
             "UPDATE BandLayout SET export_column_order = ?, updated_at = ? WHERE id = ?",
             (export_order, _now(), new_layout_id),
         )
-        conn.commit()
+        maybe_commit(conn)
     return new_layout_id
 
 
@@ -245,7 +240,7 @@ def list_layout_slots(conn: sqlite3.Connection, band_layout_id: int) -> list[Ban
             id=r[0], band_layout_id=r[1], player_id=r[2], x=r[3], y=r[4],
             width_units=r[5], height_units=r[6], created_at=r[7], updated_at=r[8],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -266,12 +261,12 @@ def set_layout_slot(
            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
         (band_layout_id, player_id, x, y, width_units, height_units, now, now),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def remove_layout_slot(conn: sqlite3.Connection, band_layout_id: int, player_id: int) -> None:
     conn.execute("DELETE FROM BandLayoutSlot WHERE band_layout_id = ? AND player_id = ?", (band_layout_id, player_id))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def get_export_column_order(conn: sqlite3.Connection, band_layout_id: int) -> list[int]:
@@ -296,7 +291,7 @@ def set_export_column_order(conn: sqlite3.Connection, band_layout_id: int, playe
         "UPDATE BandLayout SET export_column_order = ?, updated_at = ? WHERE id = ?",
         (json.dumps(player_ids), now, band_layout_id),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def replace_player_in_band_layout(
@@ -409,7 +404,7 @@ def replace_player_in_band_layout(
         "INSERT OR IGNORE INTO BandMember (band_id, player_id) VALUES (?, ?)",
         (band_id, new_player_id),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def list_layout_slots_for_export(conn: sqlite3.Connection, band_layout_id: int) -> list[BandLayoutSlotRow]:
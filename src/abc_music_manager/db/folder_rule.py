@@ -5,19 +5,41 @@ rule_type is kept for compatibility; only "exclude" is used. include_in_export:
 
 from __future__ import annotations
 
+import functools
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
 
 from ..services.preferences import get_lotro_root, get_set_export_dir
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
 
 RuleType = Literal["library_root", "set_root", "exclude"]
 
 
-@dataclass
+@functools.lru_cache(maxsize=512)
+def _resolve_str(path_str: str) -> str:
+    """Resolved form of path_str, cached: resolve() stats the filesystem and the same
+    roots/excludes are re-resolved on every scan and export."""
+    return str(Path(path_str).resolve())
+
+# Static SQL hoisted to module level so the same statement text (and sqlite3's
+# cached prepared statement) is reused on every call.
+_SQL_LIST_RULES = (
+    "SELECT id, rule_type, path, enabled, include_in_export, created_at, updated_at"
+    " FROM FolderRule ORDER BY rule_type, id"
+)
+_SQL_ENABLED_EXCLUDE_PATHS = (
+    "SELECT rule_type, path FROM FolderRule WHERE enabled = 1 AND rule_type = 'exclude'"
+)
+_SQL_ENABLED_EXCLUDES_FOR_EXPORT = (
+    "SELECT path, include_in_export FROM FolderRule WHERE enabled = 1 AND rule_type = 'exclude'"
+)
+
+
+@dataclass(slots=True)
 class FolderRuleRow:
     id: int
     rule_type: RuleType
@@ -28,15 +50,9 @@ class FolderRuleRow:
     updated_at: str
 
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
 def list_folder_rules(conn: sqlite3.Connection) -> list[FolderRuleRow]:
     """Return all folder rules, ordered by rule_type then id."""
-    cur = conn.execute(
-        "SELECT id, rule_type, path, enabled, include_in_export, created_at, updated_at FROM FolderRule ORDER BY rule_type, id"
-    )
+    cur = conn.execute(_SQL_LIST_RULES)
     return [
         FolderRuleRow(
             id=r[0],
@@ -47,7 +63,7 @@ def list_folder_rules(conn: sqlite3.Connection) -> list[FolderRuleRow]:
             created_at=r[5],
             updated_at=r[6],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -65,7 +81,7 @@ def add_folder_rule(
            VALUES (?, ?, ?, ?, ?, ?)""",
         (rule_type, path.strip(), 1 if enabled else 0, 1 if include_in_export else 0, now, now),
     )
-    conn.commit()
+    maybe_commit(conn)
     return cur.lastrowid
 
 
@@ -78,33 +94,28 @@ def update_folder_rule(
     include_in_export: bool | None = None,
 ) -> None:
     """Update path, enabled, and/or include_in_export for a FolderRule."""
-    updates = []
-    args = []
-    if path is not None:
-        updates.append("path = ?")
-        args.append(path.strip())
-    if enabled is not None:
-        updates.append("enabled = ?")
-        args.append(1 if enabled else 0)
-    if include_in_export is not None:
-        updates.append("include_in_export = ?")
-        args.append(1 if include_in_export else 0)
-    if not updates:
+    if path is None and enabled is None and include_in_export is None:
         return
-    updates.append("updated_at = ?")
-    args.append(_now())
-    args.append(rule_id)
+    # Fixed SQL shape (COALESCE keeps untouched fields) so sqlite3's statement
+    # cache hits instead of reparsing a per-combination dynamic string.
     conn.execute(
-        f"UPDATE FolderRule SET {', '.join(updates)} WHERE id = ?",
-        args,
+        """UPDATE FolderRule SET path = COALESCE(?, path), enabled = COALESCE(?, enabled),
+           include_in_export = COALESCE(?, include_in_export), updated_at = ? WHERE id = ?""",
+        (
+            path.strip() if path is not None else None,
+            None if enabled is None else (1 if enabled else 0),
+            None if include_in_export is None else (1 if include_in_export else 0),
+            _now(),
+            rule_id,
+        ),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def delete_folder_rule(conn: sqlite3.Connection, rule_id: int) -> None:
     """Delete a FolderRule by id."""
     conn.execute("DELETE FROM FolderRule WHERE id = ?", (rule_id,))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def get_enabled_roots(
@@ -119,11 +130,11 @@ def get_enabled_roots(
     library_roots = []
     set_roots = []
     lotro = get_lotro_root()
-    if lotro:
-        music = Path(lotro) / "Music"
+    music_root = Path(lotro) / "Music" if lotro else None
+    if music_root:
         try:
-            if music.exists() and music.is_dir():
-                library_roots.append(str(music.resolve()))
+            if music_root.exists() and music_root.is_dir():
+                library_roots.append(_resolve_str(str(music_root)))
         except (OSError, RuntimeError):
             pass
     set_export = get_set_export_dir()
@@ -131,28 +142,24 @@ def get_enabled_roots(
         try:
             p = Path(set_export)
             if p.exists() and p.is_dir():
-                set_roots.append(str(p.resolve()))
+                set_roots.append(_resolve_str(set_export))
         except (OSError, RuntimeError):
             pass
-    cur = conn.execute(
-        "SELECT rule_type, path FROM FolderRule WHERE enabled = 1 AND rule_type = 'exclude'"
-    )
-    music_root = Path(get_lotro_root()) / "Music" if get_lotro_root() else None
+    cur = conn.execute(_SQL_ENABLED_EXCLUDE_PATHS)
     exclude_paths = []
     # Add Set Export dir so library scan skips it (Music root scanned in full, set dir is exception).
     if set_export:
         try:
-            exclude_paths.append(str(Path(set_export).resolve()))
+            exclude_paths.append(_resolve_str(set_export))
         except (OSError, RuntimeError):
             pass
-    for _rt, path in cur.fetchall():
+    for _rt, path in cur:
         try:
             p = Path(path)
             if p.is_absolute():
                 exclude_paths.append(path)
             elif music_root and str(music_root):
-                resolved = (music_root / p).resolve()
-                exclude_paths.append(str(resolved))
+                exclude_paths.append(_resolve_str(str(music_root / p)))
             else:
                 exclude_paths.append(path)
         except (OSError, RuntimeError, ValueError):
@@ -160,7 +167,7 @@ def get_enabled_roots(
     return library_roots, set_roots, exclude_paths
 
 
-@dataclass
+@dataclass(slots=True)
 class ExcludeRuleForExport:
     """Resolved path and include_in_export for SongbookData nested-exclude logic."""
     resolved_path: str
@@ -173,18 +180,17 @@ def get_exclude_rules_for_songbook(conn: sqlite3.Connection) -> list[ExcludeRule
     Used when building SongbookData: include a path under an exclude only if the
     most specific (longest) matching exclude has include_in_export True.
     """
-    music_root = Path(get_lotro_root()) / "Music" if get_lotro_root() else None
-    cur = conn.execute(
-        "SELECT path, include_in_export FROM FolderRule WHERE enabled = 1 AND rule_type = 'exclude'"
-    )
+    lotro = get_lotro_root()
+    music_root = Path(lotro) / "Music" if lotro else None
+    cur = conn.execute(_SQL_ENABLED_EXCLUDES_FOR_EXPORT)
     rules = []
-    for path, include_in_export in cur.fetchall():
+    for path, include_in_export in cur:
         try:
             p = Path(path)
             if p.is_absolute():
-                resolved = str(p.resolve())
+                resolved = _resolve_str(path)
             elif music_root and str(music_root):
-                resolved = str((music_root / p).resolve())
+                resolved = _resolve_str(str(music_root / p))
             else:
                 resolved = path
             rules.append(ExcludeRuleForExport(resolved_path=resolved, include_in_export=bool(include_in_export)))
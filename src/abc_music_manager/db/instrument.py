@@ -6,11 +6,9 @@ Used when parsing %%made-for from ABC parts.
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime, timezone
-
-
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+from collections import OrderedDict
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
 
 # Spelling variants: ABC/LOTRO may use different spellings. Maps lowercase variant -> canonical name.
@@ -18,56 +16,106 @@ _INSTRUMENT_SPELLING_VARIANTS: dict[str, str] = {
     "traveller's trusty fiddle": "Traveler's Trusty Fiddle",
 }
 
+# In-process memo for resolve_instrument_id / get_instrument_name. The same handful of
+# instruments recurs for every part during a scan, so each hit saves a SQLite round-trip.
+# Keyed by the connection object itself (identity hash): unlike id(conn), a later
+# connection — possibly to a different database — can never inherit a freed
+# connection's entries. sqlite3.Connection does not support weak references on the
+# Python versions we target, so instead of a WeakKeyDictionary a small LRU bound
+# caps how many connections keep a memo (and a reference) alive.
+_MEMO_CONNECTIONS = 8
+_memo_by_conn: OrderedDict[
+    sqlite3.Connection, tuple[dict[str, int], dict[int, str | None]]
+] = OrderedDict()
+
+
+def _conn_memo(
+    conn: sqlite3.Connection,
+) -> tuple[dict[str, int], dict[int, str | None]]:
+    """Return this connection's (name -> id, id -> name) memo pair, creating it on first use."""
+    entry = _memo_by_conn.get(conn)
+    if entry is None:
+        entry = ({}, {})
+        _memo_by_conn[conn] = entry
+        while len(_memo_by_conn) > _MEMO_CONNECTIONS:
+            _memo_by_conn.popitem(last=False)
+    else:
+        _memo_by_conn.move_to_end(conn)
+    return entry
+
+
+def clear_instrument_cache() -> None:
+    """Drop the in-process instrument memo. Call after editing the Instrument table directly."""
+    _memo_by_conn.clear()
+
 
 def resolve_instrument_id(conn: sqlite3.Connection, name: str) -> int:
     """
     Resolve instrument by name or alternative_names (comma-separated).
     If no match, create a new Instrument and return its id.
     """
-    if not name or not name.strip():
-        return _get_or_create_by_name(conn, "Unknown")
-    return _get_or_create_by_name(conn, name.strip())
+    name = name.strip() if name and name.strip() else "Unknown"
+    memo = _conn_memo(conn)[0]
+    cached = memo.get(name.lower())
+    if cached is not None:
+        return cached
+    iid = _get_or_create_by_name(conn, name)
+    memo[name.lower()] = iid
+    return iid
+
+
+# Hot-path probes as module constants so the sqlite3 statement cache keys on the
+# same string objects every call (one probe per part during a library scan).
+_SQL_ID_BY_EXACT_NAME = "SELECT id FROM Instrument WHERE name = ?"
+_SQL_ID_BY_LOWER_OR_ALIAS = """SELECT id FROM Instrument WHERE lower(name) = ?
+       UNION ALL SELECT instrument_id FROM InstrumentAlias WHERE name_lower = ? LIMIT 1"""
 
 
 def _get_or_create_by_name(conn: sqlite3.Connection, name: str) -> int:
-    """Find by name (exact, then case-insensitive) or by alternative_names; else insert new."""
-    cur = conn.execute("SELECT id FROM Instrument WHERE name = ?", (name,))
+    """
+    Find by name (exact, then case-insensitive, then InstrumentAlias); else insert new.
+    Both fallback probes are single indexed lookups (idx_instrument_name_lower and the
+    InstrumentAlias primary key) instead of scanning the whole Instrument table.
+    """
+    cur = conn.execute(_SQL_ID_BY_EXACT_NAME, (name,))
     row = cur.fetchone()
     if row:
         return row[0]
+    name_lower = name.lower()
     # Case-insensitive match (e.g. ABC "Jaunty Hand-knells" vs schema "Jaunty Hand-Knells")
-    cur = conn.execute("SELECT id FROM Instrument WHERE LOWER(name) = LOWER(?)", (name,))
+    # or a registered alias (InstrumentAlias stores lowercased alternative names).
+    cur = conn.execute(_SQL_ID_BY_LOWER_OR_ALIAS, (name_lower, name_lower))
     row = cur.fetchone()
     if row:
         return row[0]
     # Spelling variant (e.g. "Traveller's Trusty Fiddle" vs "Traveler's Trusty Fiddle")
-    canonical = _INSTRUMENT_SPELLING_VARIANTS.get(name.lower())
+    canonical = _INSTRUMENT_SPELLING_VARIANTS.get(name_lower)
     if canonical:
-        cur = conn.execute("SELECT id FROM Instrument WHERE LOWER(name) = LOWER(?)", (canonical,))
+        cur = conn.execute("SELECT id FROM Instrument WHERE lower(name) = ?", (canonical.lower(),))
         row = cur.fetchone()
         if row:
             return row[0]
-    cur = conn.execute("SELECT id, alternative_names FROM Instrument")
-    for row in cur.fetchall():
-        aid, alts = row[0], row[1]
-        if alts:
-            for alt in (a.strip() for a in alts.split(",")):
-                if alt.lower() == name.lower():
-                    return aid
     now = _now()
     cur = conn.execute(
         "INSERT INTO Instrument (name, alternative_names, created_at, updated_at) VALUES (?, NULL, ?, ?)",
         (name, now, now),
     )
-    conn.commit()
-    return cur.lastrowid
+    maybe_commit(conn)
+    new_id = cur.lastrowid
+    _conn_memo(conn)[1][new_id] = name
+    return new_id
 
 
 def get_instrument_name(conn: sqlite3.Connection, instrument_id: int) -> str | None:
     """Return primary display name for an instrument."""
+    memo = _conn_memo(conn)[1]
+    if instrument_id in memo:
+        return memo[instrument_id]
     cur = conn.execute("SELECT name FROM Instrument WHERE id = ?", (instrument_id,))
     row = cur.fetchone()
-    return row[0] if row else None
+    name = row[0] if row else None
+    memo[instrument_id] = name
+    return name
 
 
 def get_instrument_ids_with_same_name_ci(
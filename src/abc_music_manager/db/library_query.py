@@ -8,26 +8,23 @@ from __future__ import annotations
 import json
 import sqlite3
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-from .instrument import get_instrument_name
 
 
 def list_unique_transcribers(conn: sqlite3.Connection) -> list[str]:
     """Return distinct non-null transcriber values from library songs, sorted."""
-    main_library = """
-        SELECT DISTINCT song_id FROM SongFile
-        WHERE is_primary_library = 1 AND scan_excluded = 0
-    """
     cur = conn.execute(
         """SELECT DISTINCT s.transcriber FROM Song s
-           WHERE s.id IN (""" + main_library + """)
+           WHERE EXISTS (SELECT 1 FROM SongFile sf WHERE sf.song_id = s.id
+                         AND sf.is_primary_library = 1 AND sf.scan_excluded = 0)
              AND s.transcriber IS NOT NULL AND s.transcriber != ''
            ORDER BY s.transcriber""",
     )
-    return [r[0] for r in cur.fetchall()]
+    return [r[0] for r in cur]
 
 
-@dataclass
+@dataclass(slots=True)
 class LibrarySongRow:
     song_id: int
     title: str
@@ -47,6 +44,31 @@ class LibrarySongRow:
     in_upcoming_set: bool
 
 
+# Built SQL per filter shape: the same set of active filters always yields the same
+# statement text, which also lets sqlite3's statement cache reuse the prepared plan.
+_LIBRARY_SQL_CACHE: dict[tuple[str, ...], str] = {}
+
+# Static SELECT/FROM prefix of the library query; only the Status join kind and the
+# WHERE tail are dynamic. INNER JOIN is used when a status filter guarantees
+# status_id NOT NULL, which lets SQLite drive the join from the filter. The
+# upcoming-set membership is materialized once (ius) rather than re-run as a
+# correlated subquery for every returned row.
+_LIBRARY_SELECT_PREFIX = """
+    SELECT s.id, s.title, s.composers, s.transcriber, s.duration_seconds,
+           s.part_count,
+           s.parts,
+           s.last_played_at, s.total_plays, s.rating, s.status_id,
+           st.name AS status_name, st.color AS status_color,
+           s.notes, s.lyrics,
+           ius.song_id IS NOT NULL AS in_upcoming_set
+    FROM Song s
+    {status_join} Status st ON st.id = s.status_id
+    LEFT JOIN (SELECT DISTINCT si.song_id FROM SetlistItem si
+               JOIN Setlist sl ON sl.id = si.setlist_id WHERE sl.locked = 0) ius
+        ON ius.song_id = s.id
+"""
+
+
 def list_library_songs(
     conn: sqlite3.Connection,
     *,
@@ -72,22 +94,26 @@ def list_library_songs(
     Return songs for main library view (has at least one primary, non-excluded SongFile).
     Set copies are excluded (DECISIONS 020). Optional filters applied.
     """
-    main_library = """
-        SELECT DISTINCT song_id FROM SongFile
-        WHERE is_primary_library = 1 AND scan_excluded = 0
-    """
-    conditions = ["s.id IN (" + main_library + ")"]
+    # Indexed existence probe per song (idx_songfile_primary_nonexcluded) instead of
+    # materializing a DISTINCT song_id set from SongFile first.
+    conditions = [
+        """EXISTS (SELECT 1 FROM SongFile sf WHERE sf.song_id = s.id
+                   AND sf.is_primary_library = 1 AND sf.scan_excluded = 0)"""
+    ]
     args = []
 
     if title_or_composer_substring:
         tokens = [t for t in title_or_composer_substring.lower().split() if t]
         for token in tokens:
             sub = "%" + token + "%"
-            conditions.append("(LOWER(s.title) LIKE ? OR LOWER(s.composers) LIKE ?)")
+            # title_lower/composers_lower are VIRTUAL generated columns (schema
+            # migration 15), computed on read — equivalent in cost to LOWER(col)
+            # per row; they exist to keep the lowercase expression in one place.
+            conditions.append("(s.title_lower LIKE ? OR s.composers_lower LIKE ?)")
             args.append(sub)
             args.append(sub)
     if transcriber_substring:
-        conditions.append("(s.transcriber IS NOT NULL AND LOWER(s.transcriber) LIKE ?)")
+        conditions.append("(s.transcriber_lower IS NOT NULL AND s.transcriber_lower LIKE ?)")
         args.append("%" + transcriber_substring.lower() + "%")
     if transcriber_in:
         placeholders = ",".join("?" * len(transcriber_in))
@@ -110,10 +136,10 @@ def list_library_songs(
         conditions.append(f"s.status_id IN ({placeholders})")
         args.extend(status_ids)
     if part_count_min is not None:
-        conditions.append("json_array_length(COALESCE(s.parts, '[]')) >= ?")
+        conditions.append("s.part_count >= ?")
         args.append(part_count_min)
     if part_count_max is not None:
-        conditions.append("json_array_length(COALESCE(s.parts, '[]')) <= ?")
+        conditions.append("s.part_count <= ?")
         args.append(part_count_max)
     if last_played_never:
         conditions.append("s.last_played_at IS NULL")
@@ -127,55 +153,44 @@ def list_library_songs(
     elif last_played_min_seconds_ago is not None or last_played_max_seconds_ago is not None:
         # Song played within range: last_played_at between (now - max_ago) and (now - min_ago)
         # When either bound is None (="Never"), include never-played songs (last_played_at IS NULL)
-        # Use datetime(s.last_played_at) so ISO 8601 (e.g. 2025-03-02T19:03:23+00:00) compares
-        # correctly with datetime('now', ...) which returns YYYY-MM-DD HH:MM:SS.
+        # Cutoffs are computed here in the same ISO 8601 format last_played_at is stored in
+        # (see play_log._now), so the comparison is a plain sargable string compare against
+        # idx_song_last_played instead of datetime() per row.
         include_never_played = (
             last_played_max_seconds_ago is None or last_played_min_seconds_ago is None
         )
+        now_utc = datetime.now(timezone.utc)
         if last_played_max_seconds_ago is not None:
             if include_never_played:
-                conditions.append(
-                    "(datetime(s.last_played_at) >= datetime('now', ?) OR s.last_played_at IS NULL)"
-                )
+                conditions.append("(s.last_played_at >= ? OR s.last_played_at IS NULL)")
             else:
-                conditions.append("datetime(s.last_played_at) >= datetime('now', ?)")
-            args.append(f"-{last_played_max_seconds_ago} seconds")
+                conditions.append("s.last_played_at >= ?")
+            args.append((now_utc - timedelta(seconds=last_played_max_seconds_ago)).isoformat())
         if last_played_min_seconds_ago is not None:
             if include_never_played:
-                conditions.append(
-                    "(datetime(s.last_played_at) <= datetime('now', ?) OR s.last_played_at IS NULL)"
-                )
+                conditions.append("(s.last_played_at <= ? OR s.last_played_at IS NULL)")
             else:
-                conditions.append("datetime(s.last_played_at) <= datetime('now', ?)")
-            args.append(f"-{last_played_min_seconds_ago} seconds")
+                conditions.append("s.last_played_at <= ?")
+            args.append((now_utc - timedelta(seconds=last_played_min_seconds_ago)).isoformat())
     if in_set_filter == "yes":
-        conditions.append("""EXISTS (
-            SELECT 1 FROM SetlistItem si JOIN Setlist sl ON sl.id = si.setlist_id
-            WHERE si.song_id = s.id AND sl.locked = 0
-        )""")
+        conditions.append("ius.song_id IS NOT NULL")
     elif in_set_filter == "no":
-        conditions.append("""NOT EXISTS (
-            SELECT 1 FROM SetlistItem si JOIN Setlist sl ON sl.id = si.setlist_id
-            WHERE si.song_id = s.id AND sl.locked = 0
-        )""")
+        conditions.append("ius.song_id IS NULL")
 
-    where = " AND ".join(conditions)
     args.append(limit)
 
-    sql = f"""
-        SELECT s.id, s.title, s.composers, s.transcriber, s.duration_seconds,
-               json_array_length(COALESCE(s.parts, '[]')) AS part_count,
-               s.parts,
-               s.last_played_at, s.total_plays, s.rating, s.status_id,
-               st.name AS status_name, st.color AS status_color,
-               s.notes, s.lyrics,
-               EXISTS (SELECT 1 FROM SetlistItem si JOIN Setlist sl ON sl.id = si.setlist_id WHERE si.song_id = s.id AND sl.locked = 0) AS in_upcoming_set
-        FROM Song s
-        LEFT JOIN Status st ON st.id = s.status_id
-        WHERE {where}
-        ORDER BY s.title
-        LIMIT ?
-    """
+    status_join = "INNER JOIN" if status_ids else "LEFT JOIN"
+    cache_key = (status_join, *conditions)
+    sql = _LIBRARY_SQL_CACHE.get(cache_key)
+    if sql is None:
+        where = " AND ".join(conditions)
+        prefix = _LIBRARY_SELECT_PREFIX.format(status_join=status_join)
+        # ORDER BY matches idx_song_title_nocase so LIMIT stops the index scan early
+        # instead of sorting the full result in a temp B-tree.
+        sql = f"{prefix} WHERE {where} ORDER BY s.title COLLATE NOCASE LIMIT ?"
+        if len(_LIBRARY_SQL_CACHE) > 256:
+            _LIBRARY_SQL_CACHE.clear()
+        _LIBRARY_SQL_CACHE[cache_key] = sql
     cur = conn.execute(sql, args)
     return [
         LibrarySongRow(
@@ -196,7 +211,7 @@ def list_library_songs(
             lyrics=r[14],
             in_upcoming_set=bool(r[15]),
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -213,7 +228,7 @@ def get_song_for_detail(conn: sqlite3.Connection, song_id: int) -> Optional[dict
     status_name, rating, notes, lyrics. Returns None if not found.
     """
     cur = conn.execute(
-        """SELECT s.id, s.title, s.composers, s.transcriber, s.duration_seconds, s.parts,
+        """SELECT s.id, s.title, s.composers, s.transcriber, s.duration_seconds,
                   s.rating, s.status_id, s.notes, s.lyrics, st.name AS status_name,
                   (SELECT export_timestamp FROM SongFile WHERE song_id = s.id LIMIT 1) AS export_timestamp
            FROM Song s LEFT JOIN Status st ON st.id = s.status_id WHERE s.id = ?""",
@@ -222,11 +237,23 @@ def get_song_for_detail(conn: sqlite3.Connection, song_id: int) -> Optional[dict
     row = cur.fetchone()
     if not row:
         return None
-    parts_json = row[5]
-    parts_list = json.loads(parts_json) if parts_json else []
-    for p in parts_list:
-        iid = p.get("instrument_id")
-        p["instrument_name"] = get_instrument_name(conn, iid) if iid else None
+    # Normalized SongPart rows (schema migration 17): one indexed JOIN resolves part
+    # metadata and instrument names together, no JSON decode or per-part lookups.
+    parts_list = [
+        {
+            "part_number": r[0],
+            "part_name": r[1],
+            "instrument_id": r[2],
+            "title_from_t": r[3],
+            "instrument_name": r[4],
+        }
+        for r in conn.execute(
+            """SELECT sp.part_number, sp.part_name, sp.instrument_id, sp.title_from_t, i.name
+               FROM SongPart sp LEFT JOIN Instrument i ON i.id = sp.instrument_id
+               WHERE sp.song_id = ? ORDER BY sp.part_number""",
+            (song_id,),
+        )
+    ]
     return {
         "id": row[0],
         "title": row[1],
@@ -235,12 +262,12 @@ def get_song_for_detail(conn: sqlite3.Connection, song_id: int) -> Optional[dict
         "duration_seconds": row[4],
         "part_count": len(parts_list),
         "parts": parts_list,
-        "rating": row[6],
-        "status_id": row[7],
-        "notes": row[8],
-        "lyrics": row[9],
-        "status_name": row[10],
-        "export_timestamp": row[11],
+        "rating": row[5],
+        "status_id": row[6],
+        "notes": row[7],
+        "lyrics": row[8],
+        "status_name": row[9],
+        "export_timestamp": row[10],
     }
 
 
@@ -293,3 +320,24 @@ def get_song_metadata_for_file_path(
     )
     row = cur.fetchone()
     return (row[0], row[1], row[2], row[3], row[4]) if row else None
+
+
+def get_song_metadata_for_file_paths(
+    conn: sqlite3.Connection, file_paths: list[str]
+) -> dict[str, tuple[str, str, Optional[str], Optional[int], Optional[str]]]:
+    """
+    Batch form of get_song_metadata_for_file_path: one query for all paths.
+    Returns {file_path: (title, composers, transcriber, duration_seconds, parts_json)};
+    paths not in SongFile are simply absent. json_each over one JSON parameter
+    sidesteps SQLite's bound-variable limit for large libraries.
+    """
+    if not file_paths:
+        return {}
+    cur = conn.execute(
+        """SELECT f.file_path, s.title, s.composers, s.transcriber, s.duration_seconds, s.parts
+           FROM SongFile f
+           JOIN Song s ON f.song_id = s.id
+           WHERE f.file_path IN (SELECT value FROM json_each(?))""",
+        (json.dumps(file_paths),),
+    )
+    return {row[0]: (row[1], row[2], row[3], row[4], row[5]) for row in cur}
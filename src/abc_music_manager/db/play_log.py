@@ -3,11 +3,30 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime, timezone
 
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+
+# One play was just inserted, so the stats update is pure arithmetic: bump
+# total_plays and advance last_played_at only if the new timestamp is later.
+# No MAX/COUNT re-aggregation over PlayLog per insert.
+_SQL_BUMP_PLAYSTATS = """
+    UPDATE Song SET
+        last_played_at = CASE WHEN last_played_at IS NULL OR last_played_at < ? THEN ? ELSE last_played_at END,
+        total_plays = COALESCE(total_plays, 0) + 1,
+        updated_at = ?
+    WHERE id = ?
+"""
+
+
+def repair_play_counts(conn: sqlite3.Connection, song_id: int) -> None:
+    """Recompute Song.last_played_at and total_plays from PlayLog (after edits/deletes)."""
+    conn.execute(
+        """UPDATE Song SET last_played_at = (SELECT MAX(played_at) FROM PlayLog WHERE song_id = Song.id),
+           total_plays = (SELECT COUNT(*) FROM PlayLog WHERE song_id = Song.id), updated_at = ? WHERE id = ?""",
+        (_now(), song_id),
+    )
 
 
 def log_play(
@@ -24,12 +43,8 @@ def log_play(
            VALUES (?, ?, ?, ?, ?)""",
         (song_id, now, context_setlist_id, context_note, now),
     )
-    conn.execute(
-        """UPDATE Song SET last_played_at = (SELECT MAX(played_at) FROM PlayLog WHERE song_id = Song.id),
-           total_plays = (SELECT COUNT(*) FROM PlayLog WHERE song_id = Song.id), updated_at = ? WHERE id = ?""",
-        (now, song_id),
-    )
-    conn.commit()
+    conn.execute(_SQL_BUMP_PLAYSTATS, (now, now, now, song_id))
+    maybe_commit(conn)
 
 
 def log_play_at(
@@ -46,13 +61,35 @@ def log_play_at(
            VALUES (?, ?, ?, ?, ?)""",
         (song_id, played_at_iso, context_setlist_id, context_note, played_at_iso),
     )
-    now = _now()
+    conn.execute(_SQL_BUMP_PLAYSTATS, (played_at_iso, played_at_iso, _now(), song_id))
+    maybe_commit(conn)
+
+
+def log_plays_bulk(
+    conn: sqlite3.Connection,
+    rows: list[tuple[int, str, int | None, str | None]],
+) -> None:
+    """
+    Insert many PlayLog rows (song_id, played_at_iso, context_setlist_id, context_note)
+    in one batch, then refresh stats once per affected song — one transaction instead
+    of an INSERT + UPDATE + commit per play.
+    """
+    if not rows:
+        return
+    conn.executemany(
+        """INSERT INTO PlayLog (song_id, played_at, context_setlist_id, context_note, created_at)
+           VALUES (?, ?, ?, ?, ?)""",
+        [(song_id, at, setlist_id, note, at) for song_id, at, setlist_id, note in rows],
+    )
+    song_ids = {r[0] for r in rows}
+    placeholders = ",".join("?" * len(song_ids))
     conn.execute(
-        """UPDATE Song SET last_played_at = (SELECT MAX(played_at) FROM PlayLog WHERE song_id = Song.id),
-           total_plays = (SELECT COUNT(*) FROM PlayLog WHERE song_id = Song.id), updated_at = ? WHERE id = ?""",
-        (now, song_id),
+        f"""UPDATE Song SET last_played_at = (SELECT MAX(played_at) FROM PlayLog WHERE song_id = Song.id),
+            total_plays = (SELECT COUNT(*) FROM PlayLog WHERE song_id = Song.id), updated_at = ?
+            WHERE id IN ({placeholders})""",
+        (_now(), *song_ids),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def get_play_history(
@@ -74,7 +111,7 @@ def get_play_history(
            LIMIT ?""",
         (song_id, limit),
     )
-    return [(r[0], r[1], r[2], r[3]) for r in cur.fetchall()]
+    return [(r[0], r[1], r[2], r[3]) for r in cur]
 
 
 def update_play_log_entry(
@@ -97,13 +134,8 @@ def update_play_log_entry(
         """UPDATE PlayLog SET played_at = ?, context_note = ? WHERE id = ?""",
         (played_at_iso, context_note, play_log_id),
     )
-    now = _now()
-    conn.execute(
-        """UPDATE Song SET last_played_at = (SELECT MAX(played_at) FROM PlayLog WHERE song_id = Song.id),
-           total_plays = (SELECT COUNT(*) FROM PlayLog WHERE song_id = Song.id), updated_at = ? WHERE id = ?""",
-        (now, song_id),
-    )
-    conn.commit()
+    repair_play_counts(conn, song_id)
+    maybe_commit(conn)
     return song_id
 
 
@@ -118,11 +150,6 @@ def delete_play_log_entry(conn: sqlite3.Connection, play_log_id: int) -> int | N
         return None
     song_id = row[0]
     conn.execute("DELETE FROM PlayLog WHERE id = ?", (play_log_id,))
-    now = _now()
-    conn.execute(
-        """UPDATE Song SET last_played_at = (SELECT MAX(played_at) FROM PlayLog WHERE song_id = Song.id),
-           total_plays = (SELECT COUNT(*) FROM PlayLog WHERE song_id = Song.id), updated_at = ? WHERE id = ?""",
-        (now, song_id),
-    )
-    conn.commit()
+    repair_play_counts(conn, song_id)
+    maybe_commit(conn)
     return song_id
@@ -4,14 +4,11 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-@dataclass
+@dataclass(slots=True)
 class PlayerRow:
     id: int
     name: str
@@ -21,7 +18,7 @@ class PlayerRow:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerInstrumentRow:
     id: int
     player_id: int
@@ -69,7 +66,7 @@ def list_players(
     cur = conn.execute(sql, params)
     return [
         PlayerRow(id=r[0], name=r[1], level=r[2], class_=r[3], created_at=r[4], updated_at=r[5])
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -85,7 +82,7 @@ def add_player(
         'INSERT INTO Player (name, level, "class", created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
         (name.strip(), level, class_.strip() if class_ and class_.strip() else None, now, now),
     )
-    conn.commit()
+    maybe_commit(conn)
     return cur.lastrowid
 
 
@@ -102,7 +99,7 @@ def update_player(
         'UPDATE Player SET name = ?, level = ?, "class" = ?, updated_at = ? WHERE id = ?',
         (name.strip(), level, class_.strip() if class_ and class_.strip() else None, _now(), player_id),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def delete_player(conn: sqlite3.Connection, player_id: int) -> None:
@@ -112,7 +109,7 @@ def delete_player(conn: sqlite3.Connection, player_id: int) -> None:
     conn.execute("DELETE FROM SongLayoutAssignment WHERE player_id = ?", (player_id,))
     conn.execute("DELETE FROM SetlistBandAssignment WHERE player_id = ?", (player_id,))
     conn.execute("DELETE FROM Player WHERE id = ?", (player_id,))
-    conn.commit()
+    maybe_commit(conn)
 
 
 def list_player_instruments(conn: sqlite3.Connection, player_id: int) -> list[tuple[int, str, bool, bool]]:
@@ -123,7 +120,7 @@ def list_player_instruments(conn: sqlite3.Connection, player_id: int) -> list[tu
            WHERE pi.player_id = ? ORDER BY i.name""",
         (player_id,),
     )
-    return [(r[0], r[1], bool(r[2]), bool(r[3])) for r in cur.fetchall()]
+    return [(r[0], r[1], bool(r[2]), bool(r[3])) for r in cur]
 
 
 def list_player_instruments_bulk(
@@ -139,8 +136,8 @@ def list_player_instruments_bulk(
         player_ids,
     )
     result: dict[int, set[int]] = {pid: set() for pid in player_ids}
-    for row in cur.fetchall():
-        result[row[0]].add(row[1])
+    for player_id, instrument_id in cur:
+        result[player_id].add(instrument_id)
     return result
 
 
@@ -169,9 +166,9 @@ def set_player_instrument(
                VALUES (?, ?, ?, ?, ?, ?)""",
             (player_id, instrument_id, 1 if has_instrument else 0, 1 if has_proficiency else 0, now, now),
         )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def remove_player_instrument(conn: sqlite3.Connection, player_id: int, instrument_id: int) -> None:
     conn.execute("DELETE FROM PlayerInstrument WHERE player_id = ? AND instrument_id = ?", (player_id, instrument_id))
-    conn.commit()
+    maybe_commit(conn)
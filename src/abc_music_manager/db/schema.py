@@ -6,20 +6,52 @@ Migration system: schema_version table tracks DB version. init_database() runs p
 migrations in order to bring any previous-version DB up to CURRENT_SCHEMA_VERSION.
 """
 
+import functools
 import json
 import os
 import sqlite3
+import threading
 from pathlib import Path
 
 # Current schema version. Increment when adding migrations. See SCHEMA.md.
-CURRENT_SCHEMA_VERSION = 12
+CURRENT_SCHEMA_VERSION = 20
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_data_dir(base: str) -> Path:
+    """Create the data dir once per base path; later get_db_path calls skip the mkdir/stat."""
+    path = Path(base)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@functools.lru_cache(maxsize=1)
+def _default_base() -> str:
+    """Default data dir under the user's home. Path.home() hits pwd_getpwuid on
+    POSIX, so resolve it once; the env override stays a live read for tests."""
+    return str(Path.home() / ".abc_music_manager")
 
 
 def get_db_path() -> Path:
     """Return path to the application SQLite database (local, in user data dir)."""
-    base = Path(os.environ.get("ABC_MUSIC_MANAGER_DATA", "")) or Path.home() / ".abc_music_manager"
-    base.mkdir(parents=True, exist_ok=True)
-    return base / "abc_music_manager.sqlite"
+    base = os.environ.get("ABC_MUSIC_MANAGER_DATA", "") or _default_base()
+    return _ensure_data_dir(base) / "abc_music_manager.sqlite"
+
+
+def apply_connection_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    Tune a freshly opened connection for the app's read-heavy workload.
+    WAL keeps readers unblocked during scans; synchronous=NORMAL is durable enough
+    under WAL and drops an fsync per commit. mmap/cache sizes keep the library
+    queries on memory-mapped pages instead of read() calls.
+    """
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    conn.execute("PRAGMA foreign_keys = ON")
 
 
 def create_schema(conn: sqlite3.Connection) -> None:
@@ -39,6 +71,12 @@ def create_schema(conn: sqlite3.Connection) -> None:
             updated_at TEXT NOT NULL
         )
     """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS InstrumentAlias (
+            name_lower TEXT PRIMARY KEY,
+            instrument_id INTEGER NOT NULL REFERENCES Instrument(id)
+        )
+    """)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS Status (
             id INTEGER PRIMARY KEY,
@@ -63,8 +101,22 @@ def create_schema(conn: sqlite3.Connection) -> None:
             last_played_at TEXT,
             total_plays INTEGER NOT NULL DEFAULT 0,
             parts TEXT,
+            part_count INTEGER NOT NULL DEFAULT 0,
             created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
+            updated_at TEXT NOT NULL,
+            title_lower TEXT GENERATED ALWAYS AS (lower(title)) VIRTUAL,
+            composers_lower TEXT GENERATED ALWAYS AS (lower(composers)) VIRTUAL,
+            transcriber_lower TEXT GENERATED ALWAYS AS (lower(transcriber)) VIRTUAL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS SongPart (
+            id INTEGER PRIMARY KEY,
+            song_id INTEGER NOT NULL REFERENCES Song(id),
+            part_number INTEGER,
+            part_name TEXT,
+            instrument_id INTEGER REFERENCES Instrument(id),
+            title_from_t TEXT
         )
     """)
     conn.execute("""
@@ -114,7 +166,7 @@ def create_schema(conn: sqlite3.Connection) -> None:
     """)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS BandMember (
-            band_id INTEGER NOT NULL REFERENCES Band(id),
+            band_id INTEGER NOT NULL REFERENCES Band(id) ON DELETE CASCADE,
             player_id INTEGER NOT NULL REFERENCES Player(id),
             PRIMARY KEY (band_id, player_id)
         )
@@ -122,7 +174,7 @@ def create_schema(conn: sqlite3.Connection) -> None:
     conn.execute("""
         CREATE TABLE IF NOT EXISTS BandLayout (
             id INTEGER PRIMARY KEY,
-            band_id INTEGER NOT NULL REFERENCES Band(id),
+            band_id INTEGER NOT NULL REFERENCES Band(id) ON DELETE CASCADE,
             name TEXT NOT NULL,
             export_column_order TEXT,
             created_at TEXT NOT NULL,
@@ -132,7 +184,7 @@ def create_schema(conn: sqlite3.Connection) -> None:
     conn.execute("""
         CREATE TABLE IF NOT EXISTS BandLayoutSlot (
             id INTEGER PRIMARY KEY,
-            band_layout_id INTEGER NOT NULL REFERENCES BandLayout(id),
+            band_layout_id INTEGER NOT NULL REFERENCES BandLayout(id) ON DELETE CASCADE,
             player_id INTEGER NOT NULL REFERENCES Player(id),
             x INTEGER NOT NULL,
             y INTEGER NOT NULL,
@@ -265,8 +317,78 @@ def create_schema(conn: sqlite3.Connection) -> None:
     conn.execute("CREATE INDEX IF NOT EXISTS idx_song_status_id ON Song(status_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_playlog_song_id ON PlayLog(song_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_playlog_played_at ON PlayLog(played_at)")
+    # Covers get_play_history's ORDER BY played_at DESC and the MAX(played_at)
+    # aggregate in repair_play_counts without a sort step.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_playlog_song_played ON PlayLog(song_id, played_at DESC)"
+    )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_setlistitem_setlist_id ON SetlistItem(setlist_id)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_folderrule_rule_type ON FolderRule(rule_type)")
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_folderrule_enabled_type
+           ON FolderRule(enabled, rule_type) WHERE enabled = 1"""
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_instrument_name_lower ON Instrument(lower(name))")
+    # Indexes on columns added by migrations (e.g. part_count) are created by the
+    # migrations themselves: on a pre-migration DB this code runs before the columns exist.
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_songfile_primary_nonexcluded
+           ON SongFile(song_id) WHERE is_primary_library = 1 AND scan_excluded = 0"""
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_setlistitem_song_id ON SetlistItem(song_id)")
+    conn.execute(
+        """CREATE UNIQUE INDEX IF NOT EXISTS ux_songlayoutassignment
+           ON SongLayoutAssignment(song_layout_id, player_id)"""
+    )
+    # FK columns driving hot joins/deletes; SQLite does not index FKs automatically.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_songlayout_song_id ON SongLayout(song_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_songlayout_band_layout_id ON SongLayout(band_layout_id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_setlistbandassignment_item ON SetlistBandAssignment(setlist_item_id)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bandlayoutslot_layout ON BandLayoutSlot(band_layout_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_playerinstrument_player ON PlayerInstrument(player_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bandmember_player ON BandMember(player_id)")
+    # Index-ordered range scan for list_setlist_items (ORDER BY position).
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_setlistitem_setlist_position ON SetlistItem(setlist_id, position)"
+    )
+    # Persistent view for the setlist item list: with idx_setlistitem_setlist_position
+    # this resolves to an index-ordered nested-loop join with no sort step.
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS v_setlist_items AS
+        SELECT si.id, si.setlist_id, si.song_id, si.position,
+               si.override_change_duration_seconds, si.song_layout_id,
+               si.created_at, si.updated_at, s.title AS song_title
+        FROM SetlistItem si JOIN Song s ON s.id = si.song_id
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_songpart_song ON SongPart(song_id, part_number)")
+    # Orphan cleanup and per-song file lookups join on these FKs.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_songfile_song ON SongFile(song_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_setlistitem_song ON SetlistItem(song_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_song_title_nocase ON Song(title COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_song_rating ON Song(rating) WHERE rating IS NOT NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_song_duration ON Song(duration_seconds)")
+    # Song.part_count is derived from SongPart; triggers keep it current so queries
+    # never need json_array_length or a COUNT subquery.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_songpart_insert_count AFTER INSERT ON SongPart
+        BEGIN
+            UPDATE Song SET part_count = (SELECT COUNT(*) FROM SongPart WHERE song_id = NEW.song_id)
+            WHERE id = NEW.song_id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_songpart_delete_count AFTER DELETE ON SongPart
+        BEGIN
+            UPDATE Song SET part_count = (SELECT COUNT(*) FROM SongPart WHERE song_id = OLD.song_id)
+            WHERE id = OLD.song_id;
+        END
+    """)
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_song_last_played
+           ON Song(last_played_at) WHERE last_played_at IS NOT NULL"""
+    )
 
 
 # Default statuses shipped with the app (order, name, hex color). Default "Default status" is New.
@@ -291,7 +413,6 @@ def _set_schema_version(conn: sqlite3.Connection, version: int) -> None:
     """Set schema version (replaces single row)."""
     conn.execute("DELETE FROM schema_version")
     conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
-    conn.commit()
 
 
 def _get_schema_version(conn: sqlite3.Connection) -> int:
@@ -308,7 +429,6 @@ def _set_schema_version(conn: sqlite3.Connection, version: int) -> None:
     """Set schema version (replaces single row)."""
     conn.execute("DELETE FROM schema_version")
     conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
-    conn.commit()
 
 
 def seed_defaults(conn: sqlite3.Connection) -> None:
@@ -316,17 +436,17 @@ def seed_defaults(conn: sqlite3.Connection) -> None:
     Insert default Status rows (New, Testing, Ready) with colors only when the Status table is empty.
     Does not update existing statuses, so user customizations (e.g. colors) are preserved.
     """
-    cur = conn.execute("SELECT COUNT(*) FROM Status")
-    if cur.fetchone()[0] > 0:
+    # Existence probe, not COUNT(*): stops at the first row instead of scanning
+    # the table on every startup.
+    cur = conn.execute("SELECT 1 FROM Status LIMIT 1")
+    if cur.fetchone():
         return
     from datetime import datetime, timezone
     now = datetime.now(timezone.utc).isoformat()
-    for sort_order, name, color in _DEFAULT_STATUSES:
-        conn.execute(
-            "INSERT INTO Status (id, name, color, sort_order, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
-            (sort_order + 1, name, color, sort_order, now, now),
-        )
-    conn.commit()
+    conn.executemany(
+        "INSERT INTO Status (id, name, color, sort_order, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        [(sort_order + 1, name, color, sort_order, now, now) for sort_order, name, color in _DEFAULT_STATUSES],
+    )
 
 
 def _migrate_status_drop_is_active(conn: sqlite3.Connection) -> None:
@@ -351,7 +471,6 @@ def _migrate_status_drop_is_active(conn: sqlite3.Connection) -> None:
     )
     conn.execute("DROP TABLE Status")
     conn.execute("ALTER TABLE Status_new RENAME TO Status")
-    conn.commit()
 
 
 def _backfill_song_status_ids(conn: sqlite3.Connection) -> None:
@@ -360,7 +479,6 @@ def _backfill_song_status_ids(conn: sqlite3.Connection) -> None:
     default_id = get_effective_default_status_id(conn)
     if default_id:
         conn.execute("UPDATE Song SET status_id = ? WHERE status_id IS NULL", (default_id,))
-        conn.commit()
 
 
 def _migrate_folder_rule_include_in_export(conn: sqlite3.Connection) -> None:
@@ -370,7 +488,6 @@ def _migrate_folder_rule_include_in_export(conn: sqlite3.Connection) -> None:
     if "include_in_export" in columns:
         return
     conn.execute("ALTER TABLE FolderRule ADD COLUMN include_in_export INTEGER NOT NULL DEFAULT 0")
-    conn.commit()
 
 
 def _migrate_band_notes(conn: sqlite3.Connection) -> None:
@@ -380,7 +497,6 @@ def _migrate_band_notes(conn: sqlite3.Connection) -> None:
     if "notes" in columns:
         return
     conn.execute("ALTER TABLE Band ADD COLUMN notes TEXT")
-    conn.commit()
 
 
 def _migrate_band_sort_order(conn: sqlite3.Connection) -> None:
@@ -393,7 +509,6 @@ def _migrate_band_sort_order(conn: sqlite3.Connection) -> None:
     conn.execute(
         "UPDATE Band SET sort_order = (SELECT COUNT(*) FROM Band b2 WHERE b2.id < Band.id)"
     )
-    conn.commit()
 
 
 def _migrate_setlist_notes(conn: sqlite3.Connection) -> None:
@@ -403,7 +518,6 @@ def _migrate_setlist_notes(conn: sqlite3.Connection) -> None:
     if "notes" in columns:
         return
     conn.execute("ALTER TABLE Setlist ADD COLUMN notes TEXT")
-    conn.commit()
 
 
 def _migrate_setlist_date_time_target(conn: sqlite3.Connection) -> None:
@@ -412,13 +526,10 @@ def _migrate_setlist_date_time_target(conn: sqlite3.Connection) -> None:
     columns = [row[1] for row in cur.fetchall()]
     if "set_date" not in columns:
         conn.execute("ALTER TABLE Setlist ADD COLUMN set_date TEXT")
-        conn.commit()
     if "set_time" not in columns:
         conn.execute("ALTER TABLE Setlist ADD COLUMN set_time TEXT")
-        conn.commit()
     if "target_duration_seconds" not in columns:
         conn.execute("ALTER TABLE Setlist ADD COLUMN target_duration_seconds INTEGER")
-        conn.commit()
 
 
 def _migrate_setlist_folders(conn: sqlite3.Connection) -> None:
@@ -436,15 +547,12 @@ def _migrate_setlist_folders(conn: sqlite3.Connection) -> None:
                 updated_at TEXT NOT NULL
             )
         """)
-        conn.commit()
     cur = conn.execute("PRAGMA table_info(Setlist)")
     columns = [row[1] for row in cur.fetchall()]
     if "folder_id" not in columns:
         conn.execute("ALTER TABLE Setlist ADD COLUMN folder_id INTEGER REFERENCES SetlistFolder(id)")
-        conn.commit()
     if "sort_order" not in columns:
         conn.execute("ALTER TABLE Setlist ADD COLUMN sort_order INTEGER NOT NULL DEFAULT 0")
-        conn.commit()
 
 
 # 24 LOTRO instruments for Players tab possession grid (user-specified order).
@@ -483,7 +591,6 @@ def _migrate_band_layout_export_column_order(conn: sqlite3.Connection) -> None:
     if "export_column_order" in columns:
         return
     conn.execute("ALTER TABLE BandLayout ADD COLUMN export_column_order TEXT")
-    conn.commit()
 
 
 def _migrate_band_layout_sort_order(conn: sqlite3.Connection) -> None:
@@ -500,7 +607,6 @@ def _migrate_band_layout_sort_order(conn: sqlite3.Connection) -> None:
             WHERE bl2.band_id = BandLayout.band_id AND bl2.id < BandLayout.id
         )"""
     )
-    conn.commit()
 
 
 def _migrate_player_level_class(conn: sqlite3.Connection) -> None:
@@ -509,10 +615,8 @@ def _migrate_player_level_class(conn: sqlite3.Connection) -> None:
     columns = [row[1] for row in cur.fetchall()]
     if "level" not in columns:
         conn.execute("ALTER TABLE Player ADD COLUMN level INTEGER")
-        conn.commit()
     if "class" not in columns:
         conn.execute("ALTER TABLE Player ADD COLUMN class TEXT")
-        conn.commit()
 
 
 def _migrate_song_last_layout(conn: sqlite3.Connection) -> None:
@@ -521,13 +625,10 @@ def _migrate_song_last_layout(conn: sqlite3.Connection) -> None:
     columns = [row[1] for row in cur.fetchall()]
     if "last_band_layout_id" not in columns:
         conn.execute("ALTER TABLE Song ADD COLUMN last_band_layout_id INTEGER REFERENCES BandLayout(id)")
-        conn.commit()
     if "last_song_layout_id" not in columns:
         conn.execute("ALTER TABLE Song ADD COLUMN last_song_layout_id INTEGER REFERENCES SongLayout(id)")
-        conn.commit()
     if "last_setlist_item_id" not in columns:
         conn.execute("ALTER TABLE Song ADD COLUMN last_setlist_item_id INTEGER REFERENCES SetlistItem(id)")
-        conn.commit()
 
 
 def _migrate_student_fiddle_rename(conn: sqlite3.Connection) -> None:
@@ -553,7 +654,6 @@ def _migrate_student_fiddle_rename(conn: sqlite3.Connection) -> None:
             "UPDATE Instrument SET name = ?, updated_at = ? WHERE id = ?",
             (new_name, now, old_id),
         )
-        conn.commit()
         return
 
     new_id = new_row[0]
@@ -618,7 +718,222 @@ def _migrate_student_fiddle_rename(conn: sqlite3.Connection) -> None:
             )
 
     conn.execute("DELETE FROM Instrument WHERE id = ?", (old_id,))
-    conn.commit()
+    from .instrument import clear_instrument_cache
+    clear_instrument_cache()
+
+
+def _migrate_instrument_alias_table(conn: sqlite3.Connection) -> None:
+    """
+    Create InstrumentAlias (lowercased alias -> instrument_id) and populate it from the
+    comma-separated Instrument.alternative_names column, so name resolution is an
+    indexed probe instead of a full-table scan (see instrument._get_or_create_by_name).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS InstrumentAlias (
+            name_lower TEXT PRIMARY KEY,
+            instrument_id INTEGER NOT NULL REFERENCES Instrument(id)
+        )
+    """)
+    cur = conn.execute(
+        "SELECT id, alternative_names FROM Instrument WHERE alternative_names IS NOT NULL AND alternative_names != ''"
+    )
+    for instrument_id, alts in cur.fetchall():
+        for alt in (a.strip() for a in alts.split(",")):
+            if alt:
+                conn.execute(
+                    "INSERT OR IGNORE INTO InstrumentAlias (name_lower, instrument_id) VALUES (?, ?)",
+                    (alt.lower(), instrument_id),
+                )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_instrument_name_lower ON Instrument(lower(name))")
+
+
+def _migrate_song_part_count(conn: sqlite3.Connection) -> None:
+    """
+    Add stored Song.part_count (maintained by song_repo at write time) so library
+    queries filter on an indexed column instead of json_array_length per row.
+    """
+    cur = conn.execute("PRAGMA table_info(Song)")
+    columns = [row[1] for row in cur.fetchall()]
+    if "part_count" not in columns:
+        conn.execute("ALTER TABLE Song ADD COLUMN part_count INTEGER NOT NULL DEFAULT 0")
+        conn.execute("UPDATE Song SET part_count = json_array_length(COALESCE(parts, '[]'))")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_song_part_count ON Song(part_count)")
+
+
+def _migrate_song_lower_columns(conn: sqlite3.Connection) -> None:
+    """
+    Add generated lowercase columns for title/composers/transcriber so library text
+    filters share one lowercase expression instead of repeating LOWER() inline.
+    ALTER TABLE only permits VIRTUAL generated columns, so both schema paths use
+    VIRTUAL: the values are computed on read, not stored at write time.
+    Generated columns are hidden from table_info, so probe table_xinfo here.
+    """
+    cur = conn.execute("PRAGMA table_xinfo(Song)")
+    columns = [row[1] for row in cur.fetchall()]
+    if "title_lower" not in columns:
+        conn.execute(
+            "ALTER TABLE Song ADD COLUMN title_lower TEXT GENERATED ALWAYS AS (lower(title)) VIRTUAL"
+        )
+        conn.execute(
+            "ALTER TABLE Song ADD COLUMN composers_lower TEXT GENERATED ALWAYS AS (lower(composers)) VIRTUAL"
+        )
+        conn.execute(
+            "ALTER TABLE Song ADD COLUMN transcriber_lower TEXT GENERATED ALWAYS AS (lower(transcriber)) VIRTUAL"
+        )
+
+
+def _band_cascade_rebuild_pending(conn: sqlite3.Connection) -> bool:
+    """
+    True when _migrate_band_cascade_deletes still has to rebuild the band tables
+    (BandMember exists without ON DELETE CASCADE). init_database checks this before
+    opening the init transaction: the rebuild drops referenced tables, which needs
+    foreign keys off, and PRAGMA foreign_keys is a silent no-op once a transaction
+    is open.
+    """
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'BandMember'"
+    ).fetchone()
+    return row is not None and "ON DELETE CASCADE" not in (row[0] or "")
+
+
+def _migrate_band_cascade_deletes(conn: sqlite3.Connection) -> None:
+    """
+    Recreate BandMember / BandLayout / BandLayoutSlot with ON DELETE CASCADE so
+    delete_band / delete_band_layout are single DELETE statements instead of
+    hand-ordered child deletes. Skipped when the tables already declare cascades
+    (fresh databases created by create_schema). Requires foreign keys off, which
+    init_database arranges via _band_cascade_rebuild_pending before its transaction.
+    """
+    if not _band_cascade_rebuild_pending(conn):
+        return
+    conn.execute("""
+        CREATE TABLE BandMember_new (
+            band_id INTEGER NOT NULL REFERENCES Band(id) ON DELETE CASCADE,
+            player_id INTEGER NOT NULL REFERENCES Player(id),
+            PRIMARY KEY (band_id, player_id)
+        )
+    """)
+    conn.execute("INSERT INTO BandMember_new SELECT band_id, player_id FROM BandMember")
+    conn.execute("DROP TABLE BandMember")
+    conn.execute("ALTER TABLE BandMember_new RENAME TO BandMember")
+    conn.execute("""
+        CREATE TABLE BandLayout_new (
+            id INTEGER PRIMARY KEY,
+            band_id INTEGER NOT NULL REFERENCES Band(id) ON DELETE CASCADE,
+            name TEXT NOT NULL,
+            export_column_order TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            sort_order INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(
+        """INSERT INTO BandLayout_new (id, band_id, name, export_column_order, created_at, updated_at, sort_order)
+           SELECT id, band_id, name, export_column_order, created_at, updated_at, sort_order FROM BandLayout"""
+    )
+    conn.execute("DROP TABLE BandLayout")
+    conn.execute("ALTER TABLE BandLayout_new RENAME TO BandLayout")
+    conn.execute("""
+        CREATE TABLE BandLayoutSlot_new (
+            id INTEGER PRIMARY KEY,
+            band_layout_id INTEGER NOT NULL REFERENCES BandLayout(id) ON DELETE CASCADE,
+            player_id INTEGER NOT NULL REFERENCES Player(id),
+            x INTEGER NOT NULL,
+            y INTEGER NOT NULL,
+            width_units INTEGER NOT NULL DEFAULT 7,
+            height_units INTEGER NOT NULL DEFAULT 5,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    conn.execute(
+        """INSERT INTO BandLayoutSlot_new
+           SELECT id, band_layout_id, player_id, x, y, width_units, height_units, created_at, updated_at
+           FROM BandLayoutSlot"""
+    )
+    conn.execute("DROP TABLE BandLayoutSlot")
+    conn.execute("ALTER TABLE BandLayoutSlot_new RENAME TO BandLayoutSlot")
+    # Re-create indexes dropped with the old tables (create_schema already ran this session).
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bandlayoutslot_layout ON BandLayoutSlot(band_layout_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bandmember_player ON BandMember(player_id)")
+
+
+def _migrate_song_part_rows(conn: sqlite3.Connection) -> None:
+    """
+    Create SongPart (one row per part, maintained by song_repo alongside the Song.parts
+    JSON) and backfill it from existing JSON, so the Song Detail view reads parts via a
+    single indexed JOIN instead of decoding JSON and resolving instruments per part.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS SongPart (
+            id INTEGER PRIMARY KEY,
+            song_id INTEGER NOT NULL REFERENCES Song(id),
+            part_number INTEGER,
+            part_name TEXT,
+            instrument_id INTEGER REFERENCES Instrument(id),
+            title_from_t TEXT
+        )
+    """)
+    cur = conn.execute("SELECT 1 FROM SongPart LIMIT 1")
+    if cur.fetchone() is None:
+        conn.execute(
+            """INSERT INTO SongPart (song_id, part_number, part_name, instrument_id, title_from_t)
+               SELECT s.id,
+                      json_extract(je.value, '$.part_number'),
+                      json_extract(je.value, '$.part_name'),
+                      json_extract(je.value, '$.instrument_id'),
+                      json_extract(je.value, '$.title_from_t')
+               FROM Song s, json_each(COALESCE(s.parts, '[]')) je"""
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_songpart_song ON SongPart(song_id, part_number)")
+
+
+def _migrate_song_part_count_triggers(conn: sqlite3.Connection) -> None:
+    """
+    Maintain Song.part_count with SongPart triggers (created by create_schema on
+    fresh databases) and re-sync counts once from the normalized rows.
+    """
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_songpart_insert_count AFTER INSERT ON SongPart
+        BEGIN
+            UPDATE Song SET part_count = (SELECT COUNT(*) FROM SongPart WHERE song_id = NEW.song_id)
+            WHERE id = NEW.song_id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_songpart_delete_count AFTER DELETE ON SongPart
+        BEGIN
+            UPDATE Song SET part_count = (SELECT COUNT(*) FROM SongPart WHERE song_id = OLD.song_id)
+            WHERE id = OLD.song_id;
+        END
+    """)
+    conn.execute(
+        "UPDATE Song SET part_count = (SELECT COUNT(*) FROM SongPart WHERE song_id = Song.id)"
+    )
+
+
+def _migrate_song_logical_index(conn: sqlite3.Connection) -> None:
+    """
+    Expression index matching find_song_by_logical_identity's probe, which runs once
+    per file during a library scan. Created here rather than in create_schema because
+    it covers Song.part_count, which only exists after migration 14 (see the index
+    comment in create_schema). Subsumes idx_song_title_trim_lower, so drop that too.
+    """
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_song_logical
+           ON Song(LOWER(TRIM(title)), TRIM(composers), part_count)"""
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_song_title_trim_lower")
+
+
+def _migrate_drop_song_title_lower_index(conn: sqlite3.Connection) -> None:
+    """
+    Drop idx_song_title_lower (created by migration 15): the library's substring
+    filters bind leading-wildcard LIKE patterns that can never use it, and since
+    title_lower is VIRTUAL the index forced a lower(title) evaluation plus an
+    index write on every Song insert/update for no read-side benefit.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_song_title_lower")
 
 
 # Ordered migrations: (version, migrate_func). Each upgrades from version-1 to version.
@@ -635,12 +950,24 @@ _MIGRATIONS: list[tuple[int, "function"]] = [
     (10, _migrate_player_level_class),
     (11, _migrate_song_last_layout),
     (12, _migrate_student_fiddle_rename),
+    (13, _migrate_instrument_alias_table),
+    (14, _migrate_song_part_count),
+    (15, _migrate_song_lower_columns),
+    (16, _migrate_band_cascade_deletes),
+    (17, _migrate_song_part_rows),
+    (18, _migrate_song_part_count_triggers),
+    (19, _migrate_song_logical_index),
+    (20, _migrate_drop_song_title_lower_index),
 ]
 
 
 def _run_migrations(conn: sqlite3.Connection) -> None:
     """Run any pending migrations to bring DB up to CURRENT_SCHEMA_VERSION."""
     current = _get_schema_version(conn)
+    if current >= CURRENT_SCHEMA_VERSION:
+        # Up to date: skip the migration loop (and its PRAGMA table_info probes)
+        # entirely on every launch after the first.
+        return
     for version, migrate_fn in _MIGRATIONS:
         if current < version:
             migrate_fn(conn)
@@ -652,14 +979,12 @@ def seed_player_instruments(conn: sqlite3.Connection) -> None:
     """Ensure all 24 LOTRO player instruments exist in Instrument table."""
     from datetime import datetime, timezone
     now = datetime.now(timezone.utc).isoformat()
-    for name in PLAYER_INSTRUMENTS:
-        cur = conn.execute("SELECT id FROM Instrument WHERE name = ?", (name,))
-        if cur.fetchone() is None:
-            conn.execute(
-                "INSERT INTO Instrument (name, alternative_names, created_at, updated_at) VALUES (?, NULL, ?, ?)",
-                (name, now, now),
-            )
-    conn.commit()
+    # Instrument.name is UNIQUE, so one batched INSERT OR IGNORE replaces the
+    # per-name SELECT probe + INSERT round trips, all in a single transaction.
+    conn.executemany(
+        "INSERT OR IGNORE INTO Instrument (name, alternative_names, created_at, updated_at) VALUES (?, NULL, ?, ?)",
+        [(name, now, now) for name in PLAYER_INSTRUMENTS],
+    )
 
 
 def init_database(db_path: Path | None = None) -> sqlite3.Connection:
@@ -669,10 +994,59 @@ def init_database(db_path: Path | None = None) -> sqlite3.Connection:
     Returns an open connection (caller is responsible for closing or using as context manager).
     """
     path = db_path or get_db_path()
-    conn = sqlite3.connect(str(path))
+    # Larger prepared-statement cache: the repo modules reuse fixed SQL strings
+    # (module constants), so hot CRUD paths skip re-compiling their statements.
+    conn = sqlite3.connect(str(path), cached_statements=256)
+    apply_connection_pragmas(conn)
+    # DDL-only, so it runs in autocommit mode: sqlite3 only opens its implicit
+    # transaction on the first DML statement (in the migrations/seeds below).
     create_schema(conn)
-    _run_migrations(conn)
-    seed_defaults(conn)
-    seed_player_instruments(conn)
-    _backfill_song_status_ids(conn)
+    # The band-cascade rebuild (migration 16) drops referenced tables, so foreign
+    # keys must be off while it runs — and the pragma only takes effect outside a
+    # transaction, so toggle it here (after create_schema, which asserts it back
+    # on), not inside the migration.
+    fk_off_for_rebuild = _band_cascade_rebuild_pending(conn)
+    if fk_off_for_rebuild:
+        conn.execute("PRAGMA foreign_keys = OFF")
+    # One transaction for migrations and seeds: they commit together (single
+    # fsync) instead of each step paying its own commit.
+    with conn:
+        _run_migrations(conn)
+        seed_defaults(conn)
+        seed_player_instruments(conn)
+        _backfill_song_status_ids(conn)
+    if fk_off_for_rebuild:
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise sqlite3.IntegrityError(
+                f"foreign key violations after band table rebuild: {violations[:5]}"
+            )
+        conn.execute("PRAGMA foreign_keys = ON")
     return conn
+
+
+_tls = threading.local()
+
+
+def get_shared_connection() -> sqlite3.Connection:
+    """
+    Return a long-lived connection for the calling thread, opening it via
+    init_database() on first use. Reusing one connection per thread skips the
+    sqlite3_open + PRAGMA + schema-check cost of connecting per call. sqlite3
+    connections have thread affinity, so each thread gets its own; scripts and
+    workers that cannot thread an AppState conn through should use this instead
+    of calling init_database() repeatedly.
+    """
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = init_database()
+        _tls.conn = conn
+    return conn
+
+
+def close_shared_connection() -> None:
+    """Close the calling thread's shared connection, if one was opened."""
+    conn = getattr(_tls, "conn", None)
+    if conn is not None:
+        conn.close()
+        _tls.conn = None
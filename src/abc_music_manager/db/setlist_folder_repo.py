@@ -3,15 +3,12 @@
 from __future__ import annotations
 
 import sqlite3
-from dataclasses import dataclass
-from datetime import datetime, timezone
-
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+from ._time import now_iso as _now
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class SetlistFolderRow:
     id: int
     name: str
@@ -34,7 +31,7 @@ def list_folders(conn: sqlite3.Connection) -> list[SetlistFolderRow]:
             created_at=r[3],
             updated_at=r[4],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
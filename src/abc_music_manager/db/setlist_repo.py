@@ -4,21 +4,19 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Any
 
+from ._sql import insert_returning_id, update_sql
+from ._time import now_iso as _now
+
 from .setlist_folder_repo import SetlistFolderRow, list_folders
 from .song_layout_repo import get_or_create_song_layout_for_band
 
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
 _UNSET: Any = object()
 
 
-@dataclass
+@dataclass(slots=True)
 class SetlistRow:
     id: int
     name: str
@@ -35,7 +33,7 @@ class SetlistRow:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SetlistItemRow:
     id: int
     setlist_id: int
@@ -47,7 +45,7 @@ class SetlistItemRow:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SetlistItemSongMetaRow:
     """SetlistItem joined with Song fields for the setlist editor table and set export."""
 
@@ -93,7 +91,7 @@ def list_setlists(conn: sqlite3.Connection) -> list[SetlistRow]:
             created_at=r[11],
             updated_at=r[12],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -121,10 +119,10 @@ def get_setlists_containing_song(conn: sqlite3.Connection, song_id: int) -> list
            WHERE si.song_id = ? ORDER BY sl.name""",
         (song_id,),
     )
-    return [(r[0], r[1]) for r in cur.fetchall()]
+    return [(r[0], r[1]) for r in cur]
 
 
-@dataclass
+@dataclass(slots=True)
 class SetlistLayoutForSongRow:
     """Setlist that has a defined layout for the song (set has band_layout, song has SongLayout for that band)."""
 
@@ -164,7 +162,7 @@ def get_setlists_with_layout_for_song(conn: sqlite3.Connection, song_id: int) ->
             band_layout_id=r[3],
             song_layout_id=r[4],
         )
-        for r in cur.fetchall()
+        for r in cur
         if r[4] is not None
     ]
 
@@ -178,14 +176,15 @@ def add_setlist(conn: sqlite3.Connection, name: str, folder_id: int | None = Non
         "UPDATE Setlist SET sort_order = sort_order + 1, updated_at = ? WHERE folder_id IS ?",
         (now, folder_id),
     )
-    cur = conn.execute(
+    setlist_id = insert_returning_id(
+        conn,
         """INSERT INTO Setlist (name, band_layout_id, folder_id, sort_order, locked, default_change_duration_seconds, notes,
                   set_date, set_time, target_duration_seconds, created_at, updated_at)
            VALUES (?, NULL, ?, 0, 0, NULL, NULL, ?, ?, NULL, ?, ?)""",
         (name.strip(), folder_id, today, default_time, now, now),
     )
     conn.commit()
-    return cur.lastrowid
+    return setlist_id
 
 
 def update_setlist(
@@ -203,44 +202,44 @@ def update_setlist(
     set_time: Any = _UNSET,
     target_duration_seconds: Any = _UNSET,
 ) -> None:
-    updates = []
+    columns = []
     args = []
     if name is not None:
-        updates.append("name = ?")
+        columns.append("name")
         args.append(name.strip())
     if band_layout_id is not _UNSET:
-        updates.append("band_layout_id = ?")
+        columns.append("band_layout_id")
         args.append(band_layout_id)
     if folder_id is not _UNSET:
-        updates.append("folder_id = ?")
+        columns.append("folder_id")
         args.append(folder_id)
     if sort_order is not _UNSET:
-        updates.append("sort_order = ?")
+        columns.append("sort_order")
         args.append(sort_order)
     if locked is not None:
-        updates.append("locked = ?")
+        columns.append("locked")
         args.append(1 if locked else 0)
     if default_change_duration_seconds is not _UNSET:
-        updates.append("default_change_duration_seconds = ?")
+        columns.append("default_change_duration_seconds")
         args.append(default_change_duration_seconds)
     if notes is not _UNSET:
-        updates.append("notes = ?")
+        columns.append("notes")
         args.append(notes if notes else None)
     if set_date is not _UNSET:
-        updates.append("set_date = ?")
+        columns.append("set_date")
         args.append(set_date if set_date else None)
     if set_time is not _UNSET:
-        updates.append("set_time = ?")
+        columns.append("set_time")
         args.append(set_time if set_time else None)
     if target_duration_seconds is not _UNSET:
-        updates.append("target_duration_seconds = ?")
+        columns.append("target_duration_seconds")
         args.append(target_duration_seconds)
-    if not updates:
+    if not columns:
         return
-    updates.append("updated_at = ?")
+    columns.append("updated_at")
     args.append(_now())
     args.append(setlist_id)
-    conn.execute(f"UPDATE Setlist SET {', '.join(updates)} WHERE id = ?", args)
+    conn.execute(update_sql("Setlist", tuple(columns)), args)
     conn.commit()
 
 
@@ -250,7 +249,7 @@ def _remove_setlist_items_and_orphan_layouts(conn: sqlite3.Connection, setlist_i
         "SELECT song_layout_id FROM SetlistItem WHERE setlist_id = ? AND song_layout_id IS NOT NULL",
         (setlist_id,),
     )
-    song_layout_ids = [r[0] for r in cur.fetchall()]
+    song_layout_ids = [r[0] for r in cur]
 
     conn.execute(
         "UPDATE Song SET last_setlist_item_id = NULL "
@@ -310,13 +309,12 @@ def move_setlist_to_folder(
         "SELECT id FROM Setlist WHERE folder_id IS ? AND id != ? ORDER BY sort_order, name",
         (folder_id, setlist_id),
     )
-    ids_in_order = [r[0] for r in cur.fetchall()]
+    ids_in_order = [r[0] for r in cur]
     ids_in_order.insert(sort_order, setlist_id)
-    for pos, sid in enumerate(ids_in_order):
-        conn.execute(
-            "UPDATE Setlist SET sort_order = ?, updated_at = ? WHERE id = ? AND folder_id IS ?",
-            (pos, now, sid, folder_id),
-        )
+    conn.executemany(
+        "UPDATE Setlist SET sort_order = ?, updated_at = ? WHERE id = ? AND folder_id IS ?",
+        [(pos, now, sid, folder_id) for pos, sid in enumerate(ids_in_order)],
+    )
     conn.commit()
 
 
@@ -327,20 +325,18 @@ def reorder_setlists_in_folder(
 ) -> None:
     """Set sort_order 0, 1, 2, ... for the given setlist ids in the folder."""
     now = _now()
-    for pos, sid in enumerate(setlist_ids_in_order):
-        conn.execute(
-            "UPDATE Setlist SET sort_order = ?, updated_at = ? WHERE id = ? AND folder_id IS ?",
-            (pos, now, sid, folder_id),
-        )
+    conn.executemany(
+        "UPDATE Setlist SET sort_order = ?, updated_at = ? WHERE id = ? AND folder_id IS ?",
+        [(pos, now, sid, folder_id) for pos, sid in enumerate(setlist_ids_in_order)],
+    )
     conn.commit()
 
 
 def list_setlist_items(conn: sqlite3.Connection, setlist_id: int) -> list[tuple[SetlistItemRow, str]]:
     """Return (SetlistItemRow, song_title) for each item, ordered by position."""
     cur = conn.execute(
-        """SELECT si.id, si.setlist_id, si.song_id, si.position, si.override_change_duration_seconds, si.song_layout_id, si.created_at, si.updated_at, s.title
-           FROM SetlistItem si JOIN Song s ON s.id = si.song_id
-           WHERE si.setlist_id = ? ORDER BY si.position""",
+        """SELECT id, setlist_id, song_id, position, override_change_duration_seconds, song_layout_id, created_at, updated_at, song_title
+           FROM v_setlist_items WHERE setlist_id = ? ORDER BY position""",
         (setlist_id,),
     )
     return [
@@ -357,7 +353,7 @@ def list_setlist_items(conn: sqlite3.Connection, setlist_id: int) -> list[tuple[
             ),
             r[8],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -376,7 +372,7 @@ def list_setlist_items_with_song_meta(conn: sqlite3.Connection, setlist_id: int)
         (setlist_id,),
     )
     rows = []
-    for r in cur.fetchall():
+    for r in cur:
         item = SetlistItemRow(
             id=r[0],
             setlist_id=r[1],
@@ -412,13 +408,14 @@ def add_setlist_item(
     override_change_duration_seconds: int | None = None,
 ) -> int:
     now = _now()
-    cur = conn.execute(
+    item_id = insert_returning_id(
+        conn,
         """INSERT INTO SetlistItem (setlist_id, song_id, position, override_change_duration_seconds, song_layout_id, created_at, updated_at)
            VALUES (?, ?, ?, ?, ?, ?, ?)""",
         (setlist_id, song_id, position, override_change_duration_seconds, song_layout_id, now, now),
     )
     conn.commit()
-    return cur.lastrowid
+    return item_id
 
 
 def update_setlist_item_position(conn: sqlite3.Connection, item_id: int, position: int) -> None:
@@ -433,20 +430,20 @@ def update_setlist_item(
     song_layout_id: Any = _UNSET,
     override_change_duration_seconds: Any = _UNSET,
 ) -> None:
-    updates = []
+    columns = []
     args = []
     if song_layout_id is not _UNSET:
-        updates.append("song_layout_id = ?")
+        columns.append("song_layout_id")
         args.append(song_layout_id)
     if override_change_duration_seconds is not _UNSET:
-        updates.append("override_change_duration_seconds = ?")
+        columns.append("override_change_duration_seconds")
         args.append(override_change_duration_seconds)
-    if not updates:
+    if not columns:
         return
-    updates.append("updated_at = ?")
+    columns.append("updated_at")
     args.append(_now())
     args.append(item_id)
-    conn.execute(f"UPDATE SetlistItem SET {', '.join(updates)} WHERE id = ?", args)
+    conn.execute(update_sql("SetlistItem", tuple(columns)), args)
     conn.commit()
 
 
@@ -460,11 +457,10 @@ def remove_setlist_item(conn: sqlite3.Connection, item_id: int) -> None:
 def reorder_setlist_items(conn: sqlite3.Connection, setlist_id: int, item_ids_in_order: list[int]) -> None:
     """Set position 0,1,2,... for the given item ids in order."""
     now = _now()
-    for pos, item_id in enumerate(item_ids_in_order):
-        conn.execute(
-            "UPDATE SetlistItem SET position = ?, updated_at = ? WHERE id = ? AND setlist_id = ?",
-            (pos, now, item_id, setlist_id),
-        )
+    conn.executemany(
+        "UPDATE SetlistItem SET position = ?, updated_at = ? WHERE id = ? AND setlist_id = ?",
+        [(pos, now, item_id, setlist_id) for pos, item_id in enumerate(item_ids_in_order)],
+    )
     conn.commit()
 
 
@@ -625,7 +621,7 @@ def get_setlist_band_assignments(conn: sqlite3.Connection, setlist_item_id: int)
         "SELECT player_id, part_number FROM SetlistBandAssignment WHERE setlist_item_id = ?",
         (setlist_item_id,),
     )
-    return {r[0]: r[1] for r in cur.fetchall()}
+    return {r[0]: r[1] for r in cur}
 
 
 def get_setlist_band_assignments_bulk(
@@ -641,7 +637,7 @@ def get_setlist_band_assignments_bulk(
         setlist_item_ids,
     )
     result: dict[int, dict[int, int | None]] = {i: {} for i in setlist_item_ids}
-    for r in cur.fetchall():
+    for r in cur:
         sid, pid, pn = int(r[0]), int(r[1]), r[2]
         result.setdefault(sid, {})[pid] = pn
     return result
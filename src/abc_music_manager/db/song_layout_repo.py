@@ -4,14 +4,12 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
 
+from ._sql import insert_returning_id
+from ._time import now_iso as _now
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
 
-
-@dataclass
+@dataclass(slots=True)
 class SongLayoutRow:
     id: int
     song_id: int
@@ -21,7 +19,7 @@ class SongLayoutRow:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SongLayoutAssignmentRow:
     song_layout_id: int
     player_id: int
@@ -41,7 +39,7 @@ def list_song_layouts_for_song(conn: sqlite3.Connection, song_id: int) -> list[t
             SongLayoutRow(id=r[0], song_id=r[1], band_layout_id=r[2], name=r[3], created_at=r[4], updated_at=r[5]),
             r[6],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -51,7 +49,7 @@ def list_song_layouts_for_song_and_band(conn: sqlite3.Connection, song_id: int,
         "SELECT id, song_id, band_layout_id, name, created_at, updated_at FROM SongLayout WHERE song_id = ? AND band_layout_id = ? ORDER BY name",
         (song_id, band_layout_id),
     )
-    return [SongLayoutRow(id=r[0], song_id=r[1], band_layout_id=r[2], name=r[3], created_at=r[4], updated_at=r[5]) for r in cur.fetchall()]
+    return [SongLayoutRow(id=r[0], song_id=r[1], band_layout_id=r[2], name=r[3], created_at=r[4], updated_at=r[5]) for r in cur]
 
 
 def get_or_create_song_layout_for_band(
@@ -66,33 +64,26 @@ def get_or_create_song_layout_for_band(
 
 def add_song_layout(conn: sqlite3.Connection, song_id: int, band_layout_id: int, name: str | None = None) -> int:
     now = _now()
-    cur = conn.execute(
+    layout_id = insert_returning_id(
+        conn,
         """INSERT INTO SongLayout (song_id, band_layout_id, name, created_at, updated_at)
            VALUES (?, ?, ?, ?, ?)""",
         (song_id, band_layout_id, name.strip() if name else None, now, now),
     )
     conn.commit()
-    return cur.lastrowid
+    return layout_id
 
 
 def set_song_layout_assignment(conn: sqlite3.Connection, song_layout_id: int, player_id: int, part_number: int | None) -> None:
     now = _now()
-    cur = conn.execute(
-        "SELECT id FROM SongLayoutAssignment WHERE song_layout_id = ? AND player_id = ?",
-        (song_layout_id, player_id),
+    # One upsert against ux_songlayoutassignment instead of SELECT-then-INSERT/UPDATE.
+    conn.execute(
+        """INSERT INTO SongLayoutAssignment (song_layout_id, player_id, part_number, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT(song_layout_id, player_id) DO UPDATE SET
+               part_number = excluded.part_number, updated_at = excluded.updated_at""",
+        (song_layout_id, player_id, part_number, now, now),
     )
-    row = cur.fetchone()
-    if row:
-        conn.execute(
-            "UPDATE SongLayoutAssignment SET part_number = ?, updated_at = ? WHERE id = ?",
-            (part_number, now, row[0]),
-        )
-    else:
-        conn.execute(
-            """INSERT INTO SongLayoutAssignment (song_layout_id, player_id, part_number, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?)""",
-            (song_layout_id, player_id, part_number, now, now),
-        )
     conn.commit()
 
 
@@ -101,7 +92,7 @@ def get_song_layout_assignments(conn: sqlite3.Connection, song_layout_id: int) -
         "SELECT song_layout_id, player_id, part_number FROM SongLayoutAssignment WHERE song_layout_id = ?",
         (song_layout_id,),
     )
-    return [SongLayoutAssignmentRow(song_layout_id=r[0], player_id=r[1], part_number=r[2]) for r in cur.fetchall()]
+    return [SongLayoutAssignmentRow(song_layout_id=r[0], player_id=r[1], part_number=r[2]) for r in cur]
 
 
 def delete_song_layout_assignment(
@@ -7,16 +7,14 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from datetime import datetime, timezone
 from pathlib import Path
 
 from ..parsing.abc_parser import ParsedSong
 from .instrument import resolve_instrument_id
 from .status_repo import get_effective_default_status_id
-
-
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+from ._sql import insert_returning_id
+from ._time import now_iso as _now
+from .tx import maybe_commit
 
 
 def _normalize_title(s: str) -> str:
@@ -24,8 +22,8 @@ def _normalize_title(s: str) -> str:
     return (s or "").strip().lower()
 
 
-def _parts_to_json(parsed: ParsedSong, conn: sqlite3.Connection) -> str:
-    """Build parts JSON array with instrument_id resolved from made_for."""
+def _resolve_parts(parsed: ParsedSong, conn: sqlite3.Connection) -> list[dict]:
+    """Build parts dicts with instrument_id resolved from made_for."""
     out = []
     for p in parsed.parts:
         instrument_id = None
@@ -37,7 +35,21 @@ def _parts_to_json(parsed: ParsedSong, conn: sqlite3.Connection) -> str:
             "instrument_id": instrument_id,
             "title_from_t": p.title_from_t,
         })
-    return json.dumps(out) if out else "[]"
+    return out
+
+
+def _replace_song_parts(conn: sqlite3.Connection, song_id: int, parts: list[dict]) -> None:
+    """Replace SongPart rows for a song (normalized mirror of the parts JSON)."""
+    conn.execute("DELETE FROM SongPart WHERE song_id = ?", (song_id,))
+    if parts:
+        conn.executemany(
+            """INSERT INTO SongPart (song_id, part_number, part_name, instrument_id, title_from_t)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (song_id, p["part_number"], p["part_name"], p["instrument_id"], p["title_from_t"])
+                for p in parts
+            ],
+        )
 
 
 def ensure_song_from_parsed(
@@ -50,19 +62,46 @@ def ensure_song_from_parsed(
     is_primary_library: bool = True,
     is_set_copy: bool = False,
     scan_excluded: bool = False,
+    now: str | None = None,
 ) -> int:
     """
     Create or update Song and SongFile for this path.
     If a SongFile with file_path exists, update it and its Song. Otherwise create new Song + SongFile.
+    Batch callers (scans) pass a shared `now` so one timestamp covers the whole pass.
     Returns song_id.
     """
-    now = _now()
-    parts_json = _parts_to_json(parsed, conn)
+    now = now or _now()
+    parts = _resolve_parts(parsed, conn)
+    parts_json = json.dumps(parts) if parts else "[]"
 
-    cur = conn.execute("SELECT id, song_id FROM SongFile WHERE file_path = ?", (file_path,))
+    cur = conn.execute(
+        """SELECT sf.id, sf.song_id, s.title, s.composers, s.duration_seconds, s.transcriber, s.parts,
+                  sf.file_mtime, sf.file_hash, sf.export_timestamp,
+                  sf.is_primary_library, sf.is_set_copy, sf.scan_excluded
+           FROM SongFile sf LEFT JOIN Song s ON s.id = sf.song_id
+           WHERE sf.file_path = ?""",
+        (file_path,),
+    )
     existing = cur.fetchone()
     if existing:
         file_id, song_id = existing[0], existing[1]
+        # Rescan of an untouched file: skip the UPDATEs (and their WAL writes)
+        # when nothing the parser or the filesystem reports has changed.
+        unchanged = (
+            existing[2] == parsed.title
+            and existing[3] == parsed.composers
+            and existing[4] == parsed.duration_seconds
+            and existing[5] == parsed.transcriber
+            and existing[6] == parts_json
+            and existing[7] == (file_mtime or None)
+            and existing[8] == file_hash
+            and existing[9] == parsed.export_timestamp
+            and existing[10] == (1 if is_primary_library else 0)
+            and existing[11] == (1 if is_set_copy else 0)
+            and existing[12] == (1 if scan_excluded else 0)
+        )
+        if unchanged:
+            return song_id
         conn.execute(
             """UPDATE Song SET title = ?, composers = ?, duration_seconds = ?, transcriber = ?,
                parts = ?, updated_at = ? WHERE id = ?""",
@@ -90,17 +129,18 @@ def ensure_song_from_parsed(
                 file_id,
             ),
         )
-        conn.commit()
+        _replace_song_parts(conn, song_id, parts)
+        maybe_commit(conn)
         return song_id
 
     default_status_id = get_effective_default_status_id(conn)
-    cur = conn.execute(
+    song_id = insert_returning_id(
+        conn,
         """INSERT INTO Song (title, composers, duration_seconds, transcriber, rating, status_id, notes, lyrics,
            last_played_at, total_plays, parts, created_at, updated_at)
            VALUES (?, ?, ?, ?, NULL, ?, NULL, NULL, NULL, 0, ?, ?, ?)""",
         (parsed.title, parsed.composers, parsed.duration_seconds, parsed.transcriber, default_status_id, parts_json, now, now),
     )
-    song_id = cur.lastrowid
     conn.execute(
         """INSERT INTO SongFile (song_id, file_path, file_mtime, file_hash, export_timestamp,
            is_primary_library, is_set_copy, scan_excluded, created_at, updated_at)
@@ -118,7 +158,8 @@ def ensure_song_from_parsed(
             now,
         ),
     )
-    conn.commit()
+    _replace_song_parts(conn, song_id, parts)
+    maybe_commit(conn)
     return song_id
 
 
@@ -133,9 +174,10 @@ def link_file_to_song(
     is_primary_library: bool = True,
     is_set_copy: bool = False,
     scan_excluded: bool = False,
+    now: str | None = None,
 ) -> None:
     """Add a SongFile row linking an existing file path to an existing Song (e.g. duplicate variant)."""
-    now = _now()
+    now = now or _now()
     conn.execute(
         """INSERT INTO SongFile (song_id, file_path, file_mtime, file_hash, export_timestamp,
            is_primary_library, is_set_copy, scan_excluded, created_at, updated_at)
@@ -153,7 +195,7 @@ def link_file_to_song(
             now,
         ),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def logical_identity(parsed: ParsedSong) -> tuple[str, str, int]:
@@ -173,16 +215,16 @@ def find_song_by_logical_identity(
 ) -> list[int]:
     """Return list of song_ids that match this logical identity (for duplicate handling)."""
     cur = conn.execute(
-        """SELECT id FROM Song WHERE LOWER(TRIM(title)) = ? AND TRIM(composers) = ? AND json_array_length(COALESCE(parts, '[]')) = ?""",
+        """SELECT id FROM Song WHERE LOWER(TRIM(title)) = ? AND TRIM(composers) = ? AND part_count = ?""",
         (normalized_title, composers, part_count),
     )
-    return [r[0] for r in cur.fetchall()]
+    return [r[0] for r in cur]
 
 
 def get_file_paths_for_song(conn: sqlite3.Connection, song_id: int) -> list[str]:
     """Return all file paths linked to this song."""
     cur = conn.execute("SELECT file_path FROM SongFile WHERE song_id = ?", (song_id,))
-    return [r[0] for r in cur.fetchall()]
+    return [r[0] for r in cur]
 
 
 def find_rename_candidate(
@@ -224,12 +266,14 @@ def relocate_song_file(
     is_primary_library: bool = True,
     is_set_copy: bool = False,
     scan_excluded: bool = False,
+    now: str | None = None,
 ) -> None:
     """
     Update a SongFile's path (e.g. file was moved). Updates Song metadata from parsed.
     """
-    now = _now()
-    parts_json = _parts_to_json(parsed, conn)
+    now = now or _now()
+    parts = _resolve_parts(parsed, conn)
+    parts_json = json.dumps(parts) if parts else "[]"
     cur = conn.execute(
         "SELECT id FROM SongFile WHERE song_id = ? AND file_path = ?",
         (song_id, old_path),
@@ -266,7 +310,8 @@ def relocate_song_file(
             file_id,
         ),
     )
-    conn.commit()
+    _replace_song_parts(conn, song_id, parts)
+    maybe_commit(conn)
 
 
 def get_song_last_layout(
@@ -300,7 +345,7 @@ def update_song_last_layout(
            WHERE id = ?""",
         (band_layout_id, song_layout_id, setlist_item_id, _now(), song_id),
     )
-    conn.commit()
+    maybe_commit(conn)
 
 
 def update_song_app_metadata(
@@ -336,4 +381,4 @@ def update_song_app_metadata(
         f"UPDATE Song SET {', '.join(updates)} WHERE id = ?",
         args,
     )
-    conn.commit()
+    maybe_commit(conn)
@@ -10,21 +10,23 @@ def cleanup_orphaned_songs_after_songfile_deletion(conn: sqlite3.Connection) ->
     After SongFile rows were removed, delete dependent rows and orphaned Song records.
     Matches cascade logic used at end of library scan.
     """
-    orphan_item_ids = (
-        "SELECT id FROM SetlistItem WHERE song_id NOT IN (SELECT song_id FROM SongFile WHERE song_id IS NOT NULL)"
+    # Materialize the live song-id set once; the nine statements below all
+    # probe it, instead of each re-running the same DISTINCT SongFile subquery.
+    conn.execute("DROP TABLE IF EXISTS _live_songs")
+    conn.execute(
+        "CREATE TEMP TABLE _live_songs AS SELECT DISTINCT song_id AS id FROM SongFile WHERE song_id IS NOT NULL"
     )
+    conn.execute("CREATE INDEX _live_songs_idx ON _live_songs(id)")
+    live = "SELECT id FROM _live_songs"
+    orphan_item_ids = f"SELECT id FROM SetlistItem WHERE song_id NOT IN ({live})"
     conn.execute(
         f"UPDATE Song SET last_setlist_item_id = NULL WHERE last_setlist_item_id IN ({orphan_item_ids})"
     )
     conn.execute(
         f"""DELETE FROM SetlistBandAssignment WHERE setlist_item_id IN ({orphan_item_ids})"""
     )
-    conn.execute(
-        """DELETE FROM SetlistItem WHERE song_id NOT IN (SELECT song_id FROM SongFile WHERE song_id IS NOT NULL)"""
-    )
-    orphan_layout_ids = (
-        "SELECT id FROM SongLayout WHERE song_id NOT IN (SELECT song_id FROM SongFile WHERE song_id IS NOT NULL)"
-    )
+    conn.execute(f"DELETE FROM SetlistItem WHERE song_id NOT IN ({live})")
+    orphan_layout_ids = f"SELECT id FROM SongLayout WHERE song_id NOT IN ({live})"
     conn.execute(
         f"UPDATE Song SET last_song_layout_id = NULL WHERE last_song_layout_id IN ({orphan_layout_ids})"
     )
@@ -34,15 +36,11 @@ def cleanup_orphaned_songs_after_songfile_deletion(conn: sqlite3.Connection) ->
     conn.execute(
         f"""DELETE FROM SongLayoutAssignment WHERE song_layout_id IN ({orphan_layout_ids})"""
     )
-    conn.execute(
-        f"""DELETE FROM SongLayout WHERE id IN ({orphan_layout_ids})"""
-    )
-    conn.execute(
-        """DELETE FROM PlayLog WHERE song_id NOT IN (SELECT song_id FROM SongFile WHERE song_id IS NOT NULL)"""
-    )
-    conn.execute(
-        """DELETE FROM Song WHERE id NOT IN (SELECT song_id FROM SongFile WHERE song_id IS NOT NULL)"""
-    )
+    conn.execute(f"""DELETE FROM SongLayout WHERE id IN ({orphan_layout_ids})""")
+    conn.execute(f"DELETE FROM PlayLog WHERE song_id NOT IN ({live})")
+    conn.execute(f"DELETE FROM SongPart WHERE song_id NOT IN ({live})")
+    conn.execute(f"DELETE FROM Song WHERE id NOT IN ({live})")
+    conn.execute("DROP TABLE _live_songs")
     conn.commit()
 
 
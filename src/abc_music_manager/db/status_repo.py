@@ -4,14 +4,12 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timezone
 
+from ._sql import insert_returning_id, update_sql
+from ._time import now_iso as _now
 
-def _now() -> str:
-    return datetime.now(timezone.utc).isoformat()
 
-
-@dataclass
+@dataclass(slots=True)
 class StatusRow:
     id: int
     name: str
@@ -34,7 +32,7 @@ def list_statuses(conn: sqlite3.Connection) -> list[StatusRow]:
             created_at=r[4],
             updated_at=r[5],
         )
-        for r in cur.fetchall()
+        for r in cur
     ]
 
 
@@ -56,13 +54,14 @@ def add_status(
     sort_order: int | None = None,
 ) -> int:
     now = _now()
-    cur = conn.execute(
+    status_id = insert_returning_id(
+        conn,
         """INSERT INTO Status (name, color, sort_order, created_at, updated_at)
            VALUES (?, ?, ?, ?, ?)""",
         (name.strip(), color, sort_order, now, now),
     )
     conn.commit()
-    return cur.lastrowid
+    return status_id
 
 
 def update_status(
@@ -73,31 +72,33 @@ def update_status(
     color: str | None = None,
     sort_order: int | None = None,
 ) -> None:
-    updates = []
+    columns = []
     args = []
     if name is not None:
-        updates.append("name = ?")
+        columns.append("name")
         args.append(name.strip())
     if color is not None:
-        updates.append("color = ?")
+        columns.append("color")
         args.append(color)
     if sort_order is not None:
-        updates.append("sort_order = ?")
+        columns.append("sort_order")
         args.append(sort_order)
-    if not updates:
+    if not columns:
         return
-    updates.append("updated_at = ?")
+    columns.append("updated_at")
     args.append(_now())
     args.append(status_id)
-    conn.execute(f"UPDATE Status SET {', '.join(updates)} WHERE id = ?", args)
+    conn.execute(update_sql("Status", tuple(columns)), args)
     conn.commit()
 
 
 def reorder_statuses(conn: sqlite3.Connection, id_order: list[int]) -> None:
     """Set sort_order by list position (0-based). id_order lists status ids in desired order."""
     now = _now()
-    for i, sid in enumerate(id_order):
-        conn.execute("UPDATE Status SET sort_order = ?, updated_at = ? WHERE id = ?", (i, now, sid))
+    conn.executemany(
+        "UPDATE Status SET sort_order = ?, updated_at = ? WHERE id = ?",
+        [(i, now, sid) for i, sid in enumerate(id_order)],
+    )
     conn.commit()
 
 
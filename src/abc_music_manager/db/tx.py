@@ -0,0 +1,51 @@
+"""
+Transaction helper: coalesce many repo writes into a single commit.
+
+Repo functions commit after every statement so that one-off UI edits persist
+immediately. Batch callers (scans, imports) wrap the whole operation in
+`with transaction(conn):`; repo functions use maybe_commit() instead of
+conn.commit() so the batch pays one fsync instead of one per write.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator
+
+# Connections currently inside a transaction() block, by id(conn).
+_active: set[int] = set()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, *, immediate: bool = False) -> Iterator[None]:
+    """
+    Run a block of repo calls as one transaction: commit once on success,
+    roll back on error. Nested blocks are no-ops (outermost commits).
+
+    immediate=True takes the write lock up-front (BEGIN IMMEDIATE) instead of
+    on first write; long write batches like scans use it so they wait at the
+    start (honoring busy_timeout) rather than failing mid-batch on a deferred
+    lock upgrade.
+    """
+    key = id(conn)
+    if key in _active:
+        yield
+        return
+    _active.add(key)
+    try:
+        if immediate and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        yield
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _active.discard(key)
+
+
+def maybe_commit(conn: sqlite3.Connection) -> None:
+    """Commit unless a transaction() block is active for this connection."""
+    if id(conn) not in _active:
+        conn.commit()
@@ -15,6 +15,23 @@ from typing import Optional
 # Tag names are case-sensitive (FILE_FORMATS / DECISIONS 024); no re.IGNORECASE
 _MAESTRO_TAG = re.compile(r"^%%([a-z]+(?:-[a-z]+)*)\s*(.*)$")
 
+# X: part header (X is case-insensitive in the wild). Compiled once; scans run
+# it on every candidate line across thousands of files.
+_X_PATTERN = re.compile(r"^X:\s*(\d+)", re.IGNORECASE)
+
+# All line shapes the parser cares about, as one multiline alternation:
+# groups 1-2 = Maestro tag name/value, 3-4 = X:/part number, 5-6 = T:/C:/Z:
+# header letter/value. finditer with this skips note-body lines inside the
+# regex engine, with no splitlines list and no per-line Python dispatch.
+_LINE_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"%%([a-z]+(?:-[a-z]+)*)[ \t]*([^\n]*)"
+    r"|([Xx]):[ \t]*(\d+)"
+    r"|([TCZ]):[ \t]*([^\n]*)"
+    r")",
+    re.MULTILINE,
+)
+
 
 @dataclass
 class PartInfo:
@@ -36,20 +53,15 @@ class ParsedSong:
     parts: list[PartInfo] = field(default_factory=list)
 
 
+# mm:ss with optional surrounding whitespace; seconds 00-59. Matching digit
+# groups directly means int() cannot raise, so no try/except per file.
+_MMSS_RE = re.compile(r"^\s*(\d+)\s*:\s*([0-5]?\d)\s*$")
+
+
 def _parse_mm_ss(value: str) -> Optional[int]:
     """Convert mm:ss to total seconds. Returns None if unparseable."""
-    value = value.strip()
-    if not value:
-        return None
-    parts = value.split(":")
-    if len(parts) == 2:
-        try:
-            m, s = int(parts[0].strip()), int(parts[1].strip())
-            if m >= 0 and 0 <= s < 60:
-                return m * 60 + s
-        except ValueError:
-            pass
-    return None
+    m = _MMSS_RE.match(value)
+    return int(m.group(1)) * 60 + int(m.group(2)) if m else None
 
 
 def _get_maestro_value(tags: dict[str, str], key: str) -> Optional[str]:
@@ -58,76 +70,51 @@ def _get_maestro_value(tags: dict[str, str], key: str) -> Optional[str]:
     return v.strip() if v else None
 
 
-def _parse_headers(content: str) -> tuple[dict[str, str], str, str, str]:
+def _parse_all(content: str) -> tuple[dict[str, str], str, str, str, list[PartInfo]]:
     """
-    Parse Maestro tags and first T:, C:, Z: from the file (any order).
-    Returns (maestro_tags_dict, first_T, first_C, first_Z).
+    Single pass over the file: Maestro tags and first T:, C:, Z: (any order,
+    anywhere in the file), plus part blocks. Each X: line starts a part until
+    the next X: or EOF; in a block, T: -> title_from_t, %%part-name ->
+    part_name, %%made-for -> made_for. Returns
+    (maestro_tags_dict, first_T, first_C, first_Z, parts).
     """
     maestro: dict[str, str] = {}
     first_t: Optional[str] = None
     first_c: Optional[str] = None
     first_z: Optional[str] = None
-
-    for line in content.splitlines():
-        line_stripped = line.strip()
-        if not line_stripped:
-            continue
-        m = _MAESTRO_TAG.match(line_stripped)
-        if m:
-            tag_name = m.group(1).strip().lower()
-            tag_value = m.group(2).strip() if m.group(2) is not None else ""
-            maestro[tag_name] = tag_value
-            continue
-        # ABC header: T:, C:, Z: (only first of each for fallbacks)
-        if line_stripped.startswith("T:") and first_t is None:
-            first_t = line_stripped[2:].strip()
-        elif line_stripped.startswith("C:") and first_c is None:
-            first_c = line_stripped[2:].strip()
-        elif line_stripped.startswith("Z:") and first_z is None:
-            first_z = line_stripped[2:].strip()
-
-    return maestro, first_t or "", first_c or "", first_z or ""
-
-
-def _parse_parts(content: str) -> list[PartInfo]:
-    """
-    Find all X: lines; each starts a part block until next X: or EOF.
-    In each block: X: -> part_number, T: -> title_from_t, %%part-name -> part_name, %%made-for -> made_for.
-    """
     parts: list[PartInfo] = []
-    x_pattern = re.compile(r"^X:\s*(\d+)", re.IGNORECASE)
-    lines = content.splitlines()
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        m = x_pattern.match(line.strip())
-        if m:
-            part_num = int(m.group(1))
-            part_name: Optional[str] = None
-            made_for: Optional[str] = None
-            title_from_t: Optional[str] = None
-            i += 1
-            while i < len(lines):
-                rest = lines[i]
-                stripped = rest.strip()
-                if x_pattern.match(stripped):
-                    break
-                if stripped.startswith("T:") and title_from_t is None:
-                    title_from_t = stripped[2:].strip() or None
-                else:
-                    tag = _MAESTRO_TAG.match(stripped)
-                    if tag:
-                        name = tag.group(1).strip().lower()
-                        val = (tag.group(2) or "").strip()
-                        if name == "part-name":
-                            part_name = val or None
-                        elif name == "made-for":
-                            made_for = val or None
-                i += 1
-            parts.append(PartInfo(part_number=part_num, part_name=part_name, made_for=made_for, title_from_t=title_from_t))
-            continue
-        i += 1
-    return parts
+    current: Optional[PartInfo] = None
+
+    # One compiled scan over the raw buffer: no splitlines list, no per-line
+    # strip on note-body lines — the regex engine skips those in C.
+    for m in _LINE_RE.finditer(content):
+        name = m.group(1)
+        if name is not None:
+            val = m.group(2).strip()
+            maestro[name] = val
+            if current is not None:
+                if name == "part-name":
+                    current.part_name = val or None
+                elif name == "made-for":
+                    current.made_for = val or None
+        elif m.group(3) is not None:
+            current = PartInfo(part_number=int(m.group(4)))
+            parts.append(current)
+        else:
+            header = m.group(5)
+            val = m.group(6).strip()
+            if header == "T":
+                if first_t is None:
+                    first_t = val
+                if current is not None and current.title_from_t is None:
+                    current.title_from_t = val or None
+            elif header == "C":
+                if first_c is None:
+                    first_c = val
+            elif first_z is None:  # header == "Z"
+                first_z = val
+
+    return maestro, first_t or "", first_c or "", first_z or "", parts
 
 
 def parse_abc_content(
@@ -139,8 +126,7 @@ def parse_abc_content(
     Parse ABC content (metadata and parts only; no note bodies).
     filename is used only as fallback for title when no tag/T: present.
     """
-    maestro, first_t, first_c, first_z = _parse_headers(content)
-    parts = _parse_parts(content)
+    maestro, first_t, first_c, first_z, parts = _parse_all(content)
 
     # Title: %%song-title -> T: -> filename
     title = _get_maestro_value(maestro, "song-title")
@@ -89,10 +89,9 @@ def detect_duplicate_folder_clusters(
 
     # dir_key -> (rel, identity, title sample)
     contributions: dict[str, list[tuple[str, LogicalIdentityTuple, str]]] = defaultdict(list)
-    for i, path in enumerate(files):
+    for i, (path, path_str) in enumerate(files):
         if progress_callback:
             progress_callback(i + 1, total_files)
-        path_str = str(path.resolve())
         is_primary, _is_set_copy, scan_excluded = _classify_path(
             path_str, lib_norm, set_norm, excl_norm
         )
@@ -5,10 +5,14 @@ Duplicate collisions in the primary library are deferred and resolved via on_dup
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import json
+import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 try:
     from send2trash import send2trash
@@ -32,23 +36,20 @@ from ..db.song_repo import (
     find_rename_candidate,
     get_file_paths_for_song,
     logical_identity,
-    find_song_by_logical_identity,
     relocate_song_file,
 )
 from ..db.songfile_cleanup import cleanup_orphaned_songs_after_songfile_deletion
+from ..db._time import now_iso as _scan_now
+from ..db.tx import transaction
 from .duplicate_types import DuplicateCandidate, DuplicateDecision
 from .folder_duplicate_detect import FolderDuplicateCluster
 
 
 def _path_is_under(path: str, prefix: str) -> bool:
-    """True if path is under prefix (normalized)."""
-    p = Path(path).resolve()
-    pre = Path(prefix).resolve()
-    try:
-        p.relative_to(pre)
-        return True
-    except ValueError:
-        return False
+    """True if path is under prefix. Both must already be normalized; a plain
+    component-boundary prefix compare avoids re-resolving (a syscall per call)
+    and the relative_to ValueError control flow."""
+    return path == prefix or path.startswith(prefix + os.sep)
 
 
 def _path_is_excluded(path: str, exclude_paths: list[str]) -> bool:
@@ -56,75 +57,205 @@ def _path_is_excluded(path: str, exclude_paths: list[str]) -> bool:
     return any(_path_is_under(path, ex) for ex in exclude_paths)
 
 
+# Sentinel key for root flags inside trie nodes (path components are never None).
+_FLAGS = None
+
+
+class _PathClassifier:
+    """
+    Trie over path components of the normalized library/set/exclude roots.
+    Classifying a file walks its components once — O(depth) with no resolve()
+    syscalls — instead of comparing against every root per file.
+    """
+
+    __slots__ = ("_trie",)
+
+    def __init__(
+        self,
+        library_roots: tuple[str, ...],
+        set_roots: tuple[str, ...],
+        exclude_paths: tuple[str, ...],
+    ) -> None:
+        self._trie: dict = {}
+        for flag, roots in (("lib", library_roots), ("set", set_roots), ("excl", exclude_paths)):
+            for root in roots:
+                node = self._trie
+                # split(os.sep) instead of Path.parts: components only need to be
+                # consistent between build and classify, and the split avoids a
+                # pathlib object per lookup.
+                for part in root.split(os.sep):
+                    node = node.setdefault(part, {})
+                node.setdefault(_FLAGS, set()).add(flag)
+
+    def classify(self, path_str: str) -> tuple[bool, bool, bool]:
+        """Return (is_primary_library, is_set_copy, scan_excluded) for a resolved path."""
+        under_lib = under_set = excluded = False
+        node = self._trie
+        for part in path_str.split(os.sep):
+            node = node.get(part)
+            if node is None:
+                break
+            flags = node.get(_FLAGS)
+            if flags:
+                excluded = excluded or "excl" in flags
+                under_set = under_set or "set" in flags
+                under_lib = under_lib or "lib" in flags
+        if excluded:
+            return False, False, True
+        if under_set and not under_lib:
+            return False, True, False  # set copy
+        return True, False, False  # primary library (or under both; we treat as primary)
+
+
+@functools.lru_cache(maxsize=8)
+def _classifier_for(
+    library_roots: tuple[str, ...],
+    set_roots: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+) -> _PathClassifier:
+    """One trie per distinct root configuration; every file in a scan shares it."""
+    return _PathClassifier(library_roots, set_roots, exclude_paths)
+
+
 def _classify_path(
     path: str,
     library_roots: list[str],
     set_roots: list[str],
     exclude_paths: list[str],
 ) -> tuple[bool, bool, bool]:
-    """Return (is_primary_library, is_set_copy, scan_excluded)."""
-    if _path_is_excluded(path, exclude_paths):
-        return False, False, True
-    under_set = any(_path_is_under(path, r) for r in set_roots)
-    under_lib = any(_path_is_under(path, r) for r in library_roots)
-    if under_set and not under_lib:
-        return False, True, False  # set copy
-    return True, False, False  # primary library (or under both; we treat as primary)
+    """Return (is_primary_library, is_set_copy, scan_excluded). path must be normalized."""
+    return _classifier_for(
+        tuple(library_roots), tuple(set_roots), tuple(exclude_paths)
+    ).classify(path)
 
 
 def _normalize_path(path_str: str) -> str:
-    """Resolve to absolute path for consistent comparison and existence checks."""
+    """Resolve to absolute path for consistent comparison and existence checks.
+    os.path.realpath keeps resolve()'s symlink semantics without pathlib's
+    object construction overhead."""
     try:
-        return str(Path(path_str).resolve())
-    except (OSError, RuntimeError):
+        return os.path.realpath(path_str)
+    except (OSError, RuntimeError, ValueError):
         return path_str.strip()
 
 
+# Windows filesystems are case-insensitive; match rglob's platform behavior.
+_CASEFOLD_NAMES = os.name == "nt"
+
+
+def iter_abc_files(root: str, exclude_paths: list[str] | None = None) -> Iterator[str]:
+    """
+    Yield paths of .abc files under root using an explicit os.scandir stack.
+    Compared to Path.rglob this skips Path-object allocation per directory
+    entry and, when exclude_paths is given, never descends into excluded
+    directories at all — their subtrees are pruned, not walked and filtered.
+    Like rglob, symlinked directories are not descended into (following them
+    would double-discover files and loop on self-referencing links).
+    """
+    stack = [root]
+    while stack:
+        top = stack.pop()
+        try:
+            with os.scandir(top) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not exclude_paths or not _path_is_excluded(entry.path, exclude_paths):
+                                stack.append(entry.path)
+                            continue
+                        name = entry.name.lower() if _CASEFOLD_NAMES else entry.name
+                        if name.endswith(".abc") and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_dir(dir_str: str) -> str:
+    """Resolve a directory once; all .abc siblings share the result."""
+    try:
+        return os.path.realpath(dir_str)
+    except (OSError, ValueError):
+        return dir_str
+
+
 def _collect_abc_files(
     roots: list[str],
     exclude_paths: list[str],
-) -> list[Path]:
-    """Recursively collect all .abc files under roots, skipping excluded dirs."""
-    out = []
+) -> list[tuple[str, str]]:
+    """
+    Recursively collect all .abc files under roots, skipping excluded dirs.
+    Returns (walked_path, resolved_path_str) so later stages never re-resolve.
+    """
+    out: list[tuple[str, str]] = []
     seen = set()
     for root in roots:
         root_norm = _normalize_path(root)
-        r = Path(root_norm)
-        if not r.is_dir():
+        if not os.path.isdir(root_norm):
             continue
-        for f in r.rglob("*.abc"):
-            try:
-                path_str = str(f.resolve())
-            except OSError:
-                continue
+        for fpath in iter_abc_files(root_norm, exclude_paths):
+            head, _sep, name = fpath.rpartition(os.sep)
+            path_str = os.path.join(_resolve_dir(head), name)
             if _path_is_excluded(path_str, exclude_paths):
                 continue
             if path_str in seen:
                 continue
             seen.add(path_str)
-            if f.is_file():
-                out.append(f)
+            out.append((fpath, path_str))
     return out
 
 
-def _file_mtime_str(path: Path) -> str | None:
+def _file_mtime_str(path: str | Path) -> str | None:
     try:
-        return str(path.stat().st_mtime)
+        return str(os.stat(path).st_mtime)
     except OSError:
         return None
 
 
-def _file_hash(path: Path) -> str | None:
+# hashlib.file_digest (3.11+) loops over the file in C with an internal buffer;
+# keep the chunked fallback for older interpreters.
+_file_digest = getattr(hashlib, "file_digest", None)
+
+
+def _file_hash(path: str | Path) -> str | None:
     try:
-        h = hashlib.sha256()
         with open(path, "rb") as f:
+            if _file_digest is not None:
+                return _file_digest(f, "sha256").hexdigest()
+            h = hashlib.sha256()
             for chunk in iter(lambda: f.read(65536), b""):
                 h.update(chunk)
-        return h.hexdigest()
+            return h.hexdigest()
     except OSError:
         return None
 
 
+def _extract_file(
+    item: tuple[str, str],
+    known_hashes: dict[str, tuple[str | None, str | None]],
+) -> tuple[str, ParsedSong | None, str | None, str | None]:
+    """
+    Per-file extraction for the scan: resolved path, parsed metadata, mtime, hash.
+    Runs on worker threads (file reads block on I/O; sha256 releases the GIL),
+    returning None for parsed when the file is unreadable/unparseable.
+    known_hashes maps file_path -> (stored mtime, stored hash); when the mtime
+    is unchanged the stored hash is reused, skipping the sha256 read entirely —
+    on a repeat scan of an untouched library that is nearly every file.
+    """
+    path, path_str = item
+    try:
+        parsed = parse_abc_file(path)
+    except Exception:
+        return path_str, None, None, None
+    mtime = _file_mtime_str(path)
+    stored = known_hashes.get(path_str)
+    if stored is not None and mtime is not None and stored[0] == mtime and stored[1] is not None:
+        return path_str, parsed, mtime, stored[1]
+    return path_str, parsed, mtime, _file_hash(path)
+
+
 def _apply_duplicate_resolution(
     conn: sqlite3.Connection,
     candidate: DuplicateCandidate,
@@ -248,117 +379,153 @@ def run_scan(
         tuple[str, ParsedSong, str | None, str | None, bool, bool, bool, list[int]]
     ] = []
 
-    for i, path in enumerate(files):
-        if progress_callback:
-            progress_callback(i + 1, total)
-        path_str = str(path.resolve())
-        scanned_paths.add(path_str)
-        is_primary, is_set_copy, scan_excluded = _classify_path(
-            path_str, library_roots, set_roots, exclude_paths
-        )
-        try:
-            parsed = parse_abc_file(path)
-        except Exception:
-            errors += 1
-            continue
-        mtime = _file_mtime_str(path)
-        file_hash_val = _file_hash(path)
-
-        cur = conn.execute("SELECT 1 FROM SongFile WHERE file_path = ?", (path_str,))
-        if cur.fetchone():
-            ensure_song_from_parsed(
-                conn,
-                parsed,
-                path_str,
-                file_mtime=mtime,
-                file_hash=file_hash_val,
-                is_primary_library=is_primary,
-                is_set_copy=is_set_copy,
-                scan_excluded=scan_excluded,
-            )
-            scanned += 1
-            continue
-
-        rename = find_rename_candidate(conn, path_str)
-        if rename:
-            song_id, old_path = rename
-            relocate_song_file(
-                conn,
-                song_id,
-                old_path,
-                path_str,
-                parsed,
-                file_mtime=mtime,
-                file_hash=file_hash_val,
-                is_primary_library=is_primary,
-                is_set_copy=is_set_copy,
-                scan_excluded=scan_excluded,
+    # Stored mtimes/hashes let workers skip sha256 for untouched files.
+    known_hashes: dict[str, tuple[str | None, str | None]] = {
+        row[0]: (row[1], row[2])
+        for row in conn.execute("SELECT file_path, file_mtime, file_hash FROM SongFile")
+    }
+
+    # Duplicate detection looks up logical identity per new file; load the
+    # whole index once instead of a SELECT per file. Kept current below as
+    # the scan indexes songs, so same-scan collisions are still caught.
+    identity_index: dict[tuple[str, str, int], list[int]] = {}
+    if on_duplicates_batch:
+        for norm_title, composers, part_count, song_id in conn.execute(
+            "SELECT LOWER(TRIM(title)), TRIM(composers), part_count, id FROM Song"
+        ):
+            identity_index.setdefault((norm_title, composers, part_count), []).append(song_id)
+
+    # One timestamp for every row touched by this pass: files indexed in the
+    # same scan share created_at/updated_at, and the repo skips a datetime
+    # allocation + format per file.
+    scan_now = _scan_now()
+
+    # Parse + hash on a thread pool (reads block on I/O, sha256 releases the
+    # GIL); executor.map keeps results in file order so the serial DB writes
+    # below see the same sequence as the old loop.
+    # One commit for the whole indexing pass (repo functions defer via maybe_commit).
+    with transaction(conn, immediate=True), ThreadPoolExecutor(
+        max_workers=min(8, os.cpu_count() or 1)
+    ) as pool:
+        for i, (path_str, parsed, mtime, file_hash_val) in enumerate(
+            pool.map(lambda p: _extract_file(p, known_hashes), files)
+        ):
+            if progress_callback:
+                progress_callback(i + 1, total)
+            scanned_paths.add(path_str)
+            if parsed is None:
+                errors += 1
+                continue
+            is_primary, is_set_copy, scan_excluded = _classify_path(
+                path_str, library_roots, set_roots, exclude_paths
             )
-            scanned += 1
-            continue
 
-        if is_primary and on_duplicates_batch:
-            norm_title, composers, part_count = logical_identity(parsed)
-            existing_ids = find_song_by_logical_identity(conn, norm_title, composers, part_count)
-            if existing_ids:
-                deferred_duplicates.append(
-                    (path_str, parsed, mtime, file_hash_val, is_primary, is_set_copy, scan_excluded, existing_ids)
+            # known_hashes doubles as the set of already-indexed paths, so the
+            # per-file existence SELECT is answered from the prefetched map.
+            if path_str in known_hashes:
+                song_id = ensure_song_from_parsed(
+                    conn,
+                    parsed,
+                    path_str,
+                    file_mtime=mtime,
+                    file_hash=file_hash_val,
+                    is_primary_library=is_primary,
+                    is_set_copy=is_set_copy,
+                    scan_excluded=scan_excluded,
+                    now=scan_now,
                 )
+                if on_duplicates_batch:
+                    ids = identity_index.setdefault(logical_identity(parsed), [])
+                    if song_id not in ids:
+                        ids.append(song_id)
+                scanned += 1
                 continue
 
-        ensure_song_from_parsed(
-            conn,
-            parsed,
-            path_str,
-            file_mtime=mtime,
-            file_hash=file_hash_val,
-            is_primary_library=is_primary,
-            is_set_copy=is_set_copy,
-            scan_excluded=scan_excluded,
-        )
-        scanned += 1
-
-    pending_true: list[DuplicateCandidate] = []
+            rename = find_rename_candidate(conn, path_str)
+            if rename:
+                song_id, old_path = rename
+                relocate_song_file(
+                    conn,
+                    song_id,
+                    old_path,
+                    path_str,
+                    parsed,
+                    file_mtime=mtime,
+                    file_hash=file_hash_val,
+                    is_primary_library=is_primary,
+                    is_set_copy=is_set_copy,
+                    scan_excluded=scan_excluded,
+                    now=scan_now,
+                )
+                scanned += 1
+                continue
 
-    for path_str, parsed, mtime, file_hash_val, is_primary, is_set_copy, scan_excluded, existing_ids in deferred_duplicates:
-        move_song_id: int | None = None
-        move_old_path: str | None = None
-        for sid in existing_ids:
-            existing_paths = get_file_paths_for_song(conn, sid)
-            missing_paths = [p for p in existing_paths if p not in scanned_paths]
-            if len(missing_paths) == 1 and len(existing_paths) == 1:
-                move_song_id = sid
-                move_old_path = missing_paths[0]
-                break
+            if is_primary and on_duplicates_batch:
+                existing_ids = identity_index.get(logical_identity(parsed))
+                if existing_ids:
+                    deferred_duplicates.append(
+                        (path_str, parsed, mtime, file_hash_val, is_primary, is_set_copy, scan_excluded, list(existing_ids))
+                    )
+                    continue
 
-        if move_song_id is not None and move_old_path is not None:
-            relocate_song_file(
+            song_id = ensure_song_from_parsed(
                 conn,
-                move_song_id,
-                move_old_path,
-                path_str,
                 parsed,
+                path_str,
                 file_mtime=mtime,
                 file_hash=file_hash_val,
                 is_primary_library=is_primary,
                 is_set_copy=is_set_copy,
                 scan_excluded=scan_excluded,
+                now=scan_now,
             )
+            if on_duplicates_batch:
+                identity_index.setdefault(logical_identity(parsed), []).append(song_id)
             scanned += 1
-            continue
 
-        pending_true.append(
-            DuplicateCandidate(
-                new_path=path_str,
-                parsed=parsed,
-                mtime=mtime,
-                file_hash=file_hash_val,
-                is_primary=is_primary,
-                is_set_copy=is_set_copy,
-                scan_excluded=scan_excluded,
-                existing_song_ids=list(existing_ids),
+    pending_true: list[DuplicateCandidate] = []
+
+    with transaction(conn):
+        for path_str, parsed, mtime, file_hash_val, is_primary, is_set_copy, scan_excluded, existing_ids in deferred_duplicates:
+            move_song_id: int | None = None
+            move_old_path: str | None = None
+            for sid in existing_ids:
+                existing_paths = get_file_paths_for_song(conn, sid)
+                missing_paths = [p for p in existing_paths if p not in scanned_paths]
+                if len(missing_paths) == 1 and len(existing_paths) == 1:
+                    move_song_id = sid
+                    move_old_path = missing_paths[0]
+                    break
+
+            if move_song_id is not None and move_old_path is not None:
+                relocate_song_file(
+                    conn,
+                    move_song_id,
+                    move_old_path,
+                    path_str,
+                    parsed,
+                    file_mtime=mtime,
+                    file_hash=file_hash_val,
+                    is_primary_library=is_primary,
+                    is_set_copy=is_set_copy,
+                    scan_excluded=scan_excluded,
+                    now=scan_now,
+                )
+                scanned += 1
+                continue
+
+            pending_true.append(
+                DuplicateCandidate(
+                    new_path=path_str,
+                    parsed=parsed,
+                    mtime=mtime,
+                    file_hash=file_hash_val,
+                    is_primary=is_primary,
+                    is_set_copy=is_set_copy,
+                    scan_excluded=scan_excluded,
+                    existing_song_ids=list(existing_ids),
+                )
             )
-        )
 
     if (
         pending_true
@@ -390,10 +557,11 @@ def run_scan(
         ):
             decisions = [DuplicateDecision(c.new_path, "ignore", None) for c in pending_true]
 
-        for cand, dec in zip(pending_true, decisions):
-            scanned += _apply_duplicate_resolution(
-                conn, cand, dec.action, dec.existing_song_id
-            )
+        with transaction(conn):
+            for cand, dec in zip(pending_true, decisions):
+                scanned += _apply_duplicate_resolution(
+                    conn, cand, dec.action, dec.existing_song_id
+                )
 
     _remove_missing_song_files(conn, scanned_paths)
 
@@ -408,10 +576,11 @@ def _remove_missing_song_files(conn: sqlite3.Connection, current_paths: set[str]
     if not current_paths:
         conn.execute("DELETE FROM SongFile")
     else:
-        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _scan_paths (path TEXT PRIMARY KEY)")
-        conn.execute("DELETE FROM _scan_paths")
-        conn.executemany("INSERT OR IGNORE INTO _scan_paths (path) VALUES (?)", [(p,) for p in current_paths])
-        conn.execute("DELETE FROM SongFile WHERE file_path NOT IN (SELECT path FROM _scan_paths)")
-        conn.execute("DROP TABLE IF EXISTS _scan_paths")
+        # One statement instead of the temp-table create/fill/drop dance; a single
+        # JSON parameter sidesteps the bound-variable limit for large libraries.
+        conn.execute(
+            "DELETE FROM SongFile WHERE file_path NOT IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted(current_paths)),),
+        )
 
     cleanup_orphaned_songs_after_songfile_deletion(conn)
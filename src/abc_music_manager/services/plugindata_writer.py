@@ -8,67 +8,62 @@ Paths in output are relative to \\Music\\.
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 from ..db.folder_rule import get_exclude_rules_for_songbook, ExcludeRuleForExport
-from ..db.library_query import get_song_metadata_for_file_path
+from ..db.library_query import get_song_metadata_for_file_paths
 from ..db.instrument import resolve_instrument_id
 from ..db.account_target import list_account_targets
 from ..parsing.abc_parser import parse_abc_file
+from ..scanning.scanner import iter_abc_files
 from ..services.preferences import get_music_root, get_set_export_dir, to_music_relative
 
 
 def _normalize_path(path_str: str) -> str:
     try:
-        return str(Path(path_str).resolve())
-    except (OSError, RuntimeError):
+        return os.path.realpath(path_str)
+    except (OSError, RuntimeError, ValueError):
         return path_str.strip()
 
 
 def _path_is_under(path: str, prefix: str) -> bool:
-    """True if path is under prefix (normalized)."""
-    p = Path(path).resolve()
-    pre = Path(prefix).resolve()
-    try:
-        p.relative_to(pre)
-        return True
-    except ValueError:
-        return False
+    """True if path equals or lies under prefix. Both must already be normalized."""
+    return path == prefix or path.startswith(prefix + os.sep)
 
 
-def _most_specific_exclude_rule(
-    path: str, rules: list[ExcludeRuleForExport]
-) -> ExcludeRuleForExport | None:
-    """Return the exclude rule with the longest path that contains path, or None."""
-    containing = [r for r in rules if _path_is_under(path, r.resolved_path)]
-    if not containing:
-        return None
-    return max(containing, key=lambda r: len(r.resolved_path))
+def _sorted_exclude_prefixes(
+    rules: list[ExcludeRuleForExport],
+) -> list[tuple[str, ExcludeRuleForExport]]:
+    """
+    Resolve each rule path once and sort longest-first, so a prefix walk
+    finds the most specific containing rule on first match.
+    """
+    resolved = [(_normalize_path(r.resolved_path), r) for r in rules]
+    return sorted(resolved, key=lambda t: -len(t[0]))
 
 
 def _include_path_in_songbook(
     path_str: str,
-    music_root: str,
-    set_export_dir: str,
-    exclude_rules: list[ExcludeRuleForExport],
+    music_norm: str,
+    set_export_norm: str,
+    rule_prefixes: list[tuple[str, ExcludeRuleForExport]],
 ) -> bool:
     """
-    True if path should be included in SongbookData.
-    Include: under set_export_dir; or under music_root and (not under any exclude, or most specific exclude has include_in_export).
+    True if path should be included in SongbookData. path_str, music_norm and
+    set_export_norm must already be normalized; rule_prefixes comes from
+    _sorted_exclude_prefixes. Include: under set_export dir; or under music root
+    and (not under any exclude, or most specific exclude has include_in_export).
     """
-    path_str = _normalize_path(path_str)
-    music_root = _normalize_path(music_root) if music_root else ""
-    set_export_dir = _normalize_path(set_export_dir) if set_export_dir else ""
-
-    if set_export_dir and _path_is_under(path_str, set_export_dir):
+    if set_export_norm and _path_is_under(path_str, set_export_norm):
         return True
-    if not music_root or not _path_is_under(path_str, music_root):
+    if not music_norm or not _path_is_under(path_str, music_norm):
         return False
-    rule = _most_specific_exclude_rule(path_str, exclude_rules)
-    if rule is None:
-        return True
-    return rule.include_in_export
+    for prefix, rule in rule_prefixes:
+        if _path_is_under(path_str, prefix):
+            return rule.include_in_export
+    return True
 
 
 def _collect_songbook_abc_paths(
@@ -83,6 +78,7 @@ def _collect_songbook_abc_paths(
     out: list[Path] = []
     music_norm = _normalize_path(music_root) if music_root else ""
     set_export_norm = _normalize_path(set_export_dir) if set_export_dir else ""
+    rule_prefixes = _sorted_exclude_prefixes(exclude_rules)
 
     def add(path: Path) -> None:
         try:
@@ -94,17 +90,15 @@ def _collect_songbook_abc_paths(
         seen.add(path_str)
         out.append(path)
 
-    if music_norm:
-        music_p = Path(music_norm)
-        if music_p.is_dir():
-            for f in music_p.rglob("*.abc"):
-                if _include_path_in_songbook(str(f.resolve()), music_root, set_export_dir, exclude_rules):
-                    add(f)
-    if set_export_norm:
-        set_p = Path(set_export_norm)
-        if set_p.is_dir():
-            for f in set_p.rglob("*.abc"):
-                add(f)
+    if music_norm and Path(music_norm).is_dir():
+        for fpath in iter_abc_files(music_norm):
+            if _include_path_in_songbook(
+                str(Path(fpath).resolve()), music_norm, set_export_norm, rule_prefixes
+            ):
+                add(Path(fpath))
+    if set_export_norm and Path(set_export_norm).is_dir():
+        for fpath in iter_abc_files(set_export_norm):
+            add(Path(fpath))
     return out
 
 
@@ -137,13 +131,14 @@ def build_plugindata_lua(conn) -> tuple[str, int, int]:
     set_export_dir = get_set_export_dir()
     exclude_rules = get_exclude_rules_for_songbook(conn)
     paths = _collect_songbook_abc_paths(music_root, set_export_dir, exclude_rules)
+    path_strs = [str(p.resolve()) for p in paths]
+    meta_by_path = get_song_metadata_for_file_paths(conn, path_strs)
 
     dirs_set: set[str] = set()
     dirs_set.add("/")
     songs_data: list[dict] = []
 
-    for path in paths:
-        path_str = str(path.resolve())
+    for path, path_str in zip(paths, path_strs):
         rel = to_music_relative(path_str)
         if not rel:
             rel = path_str
@@ -151,7 +146,7 @@ def build_plugindata_lua(conn) -> tuple[str, int, int]:
         if not rel_posix.startswith("/"):
             rel_posix = "/" + rel_posix
 
-        meta = get_song_metadata_for_file_path(conn, path_str)
+        meta = meta_by_path.get(path_str)
         if meta is None:
             try:
                 parsed = parse_abc_file(path)
@@ -212,34 +207,40 @@ def build_plugindata_lua(conn) -> tuple[str, int, int]:
 
     dirs_sorted = sorted(dirs_set, key=_dir_sort_key)
     songs_sorted = sorted(songs_data, key=lambda s: _dir_sort_key(s["filepath"] + s["filename"]))
-    lines = ["return", "{"]
-    lines.append('\t["Directories"] =')
-    lines.append("\t{")
+    lua = "\n".join(_iter_lua_lines(dirs_sorted, songs_sorted))
+    return lua, len(songs_sorted), len(dirs_sorted)
+
+
+def _iter_lua_lines(dirs_sorted: list[str], songs_sorted: list[dict]) -> Iterator[str]:
+    """Yield the SongbookData Lua table line by line (joined once by the caller)."""
+    yield "return"
+    yield "{"
+    yield '\t["Directories"] ='
+    yield "\t{"
     for i, d in enumerate(dirs_sorted, 1):
-        lines.append(f'\t\t[{i}] = "{_lua_escape(d)}",')
-    lines.append("\t},")
-    lines.append('\t["Songs"] =')
-    lines.append("\t{")
+        yield f'\t\t[{i}] = "{_lua_escape(d)}",'
+    yield "\t},"
+    yield '\t["Songs"] ='
+    yield "\t{"
     for si, song in enumerate(songs_sorted, 1):
-        lines.append(f"\t\t[{si}] =")
-        lines.append("\t\t{")
-        lines.append(f'\t\t\t["Filepath"] = "{_lua_escape(song["filepath"])}",')
-        lines.append(f'\t\t\t["Filename"] = "{_lua_escape(song["filename"])}",')
-        lines.append('\t\t\t["Tracks"] =')
-        lines.append("\t\t\t{")
+        yield f"\t\t[{si}] ="
+        yield "\t\t{"
+        yield f'\t\t\t["Filepath"] = "{_lua_escape(song["filepath"])}",'
+        yield f'\t\t\t["Filename"] = "{_lua_escape(song["filename"])}",'
+        yield '\t\t\t["Tracks"] ='
+        yield "\t\t\t{"
         for ti, (tid, tname) in enumerate(song["tracks"], 1):
-            lines.append(f"\t\t\t\t[{ti}] =")
-            lines.append("\t\t\t\t{")
-            lines.append(f'\t\t\t\t\t["Id"] ="{_lua_escape(tid)}",')
-            lines.append(f'\t\t\t\t\t["Name"] ="{_lua_escape(tname)}"')
-            lines.append("\t\t\t\t},")
-        lines.append("\t\t\t},")
-        lines.append(f'\t\t\t["Transcriber"] = "{_lua_escape(song["transcriber"])}",')
-        lines.append(f'\t\t\t["Artist"] = "{_lua_escape(song["artist"])}"')
-        lines.append("\t\t},")
-    lines.append("\t}")
-    lines.append("}")
-    return "\n".join(lines), len(songs_sorted), len(dirs_sorted)
+            yield f"\t\t\t\t[{ti}] ="
+            yield "\t\t\t\t{"
+            yield f'\t\t\t\t\t["Id"] ="{_lua_escape(tid)}",'
+            yield f'\t\t\t\t\t["Name"] ="{_lua_escape(tname)}"'
+            yield "\t\t\t\t},"
+        yield "\t\t\t},"
+        yield f'\t\t\t["Transcriber"] = "{_lua_escape(song["transcriber"])}",'
+        yield f'\t\t\t["Artist"] = "{_lua_escape(song["artist"])}"'
+        yield "\t\t},"
+    yield "\t}"
+    yield "}"
 
 
 def write_plugindata_to_path(conn, target_path: str, lua_content: str) -> None:
@@ -247,7 +248,8 @@ def write_plugindata_to_path(conn, target_path: str, lua_content: str) -> None:
     path = Path(target_path)
     path.mkdir(parents=True, exist_ok=True)
     out_file = path / "SongbookData.plugindata"
-    out_file.write_text(lua_content, encoding="utf-8")
+    with open(out_file, "w", encoding="utf-8", newline="") as f:
+        f.write(lua_content)
 
 
 def write_plugindata_all_targets(
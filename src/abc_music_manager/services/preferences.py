@@ -4,15 +4,41 @@ User preferences (e.g. default status for library). Stored as JSON alongside use
 
 from __future__ import annotations
 
+import functools
 import json
+import os
 import sys
 import uuid
 from pathlib import Path
 from typing import Any, TypedDict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _skip_all_saves = False
 
 
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes; orjson when available, stdlib otherwise."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes; orjson when available, stdlib otherwise."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+# In-process cache: (path, mtime_ns, size) of the file last parsed, plus the
+# parsed dict. Every getter calls load_preferences(); without this each one
+# re-opens and re-parses preferences.json. Reload only when the key changes;
+# nanosecond mtime plus size catches rewrites within one timestamp tick.
+_prefs_cache: dict[str, Any] | None = None
+_prefs_cache_key: tuple[str, int, int] | None = None
+
+
 def _preferences_path() -> Path:
     from ..db.schema import get_db_path
 
@@ -26,25 +52,52 @@ def set_skip_all_saves(value: bool) -> None:
 
 
 def load_preferences() -> dict[str, Any]:
-    """Load preferences from disk. Returns dict; missing file or invalid JSON => {}."""
+    """Load preferences from disk (cached per mtime). Missing file or invalid JSON => {}."""
+    global _prefs_cache, _prefs_cache_key
     path = _preferences_path()
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         return {}
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if _prefs_cache is not None and _prefs_cache_key == key:
+        return dict(_prefs_cache)
     try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
+        # Binary read + loads: the parser handles the decoding, skipping the
+        # TextIOWrapper pass.
+        with open(path, "rb") as f:
+            prefs = _loads(f.read())
+    except (ValueError, OSError):
+        return {}
+    if not isinstance(prefs, dict):
         return {}
+    _prefs_cache = prefs
+    _prefs_cache_key = key
+    return dict(prefs)
 
 
 def save_preferences(prefs: dict[str, Any]) -> None:
-    """Save preferences to disk."""
+    """Save preferences to disk (atomically: temp file + rename)."""
+    global _prefs_cache, _prefs_cache_key
     if _skip_all_saves:
         return
     path = _preferences_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(prefs, f, indent=2)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_dumps(prefs))
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass  # some filesystems don't support fsync; rename alone still beats truncate-write
+    os.replace(tmp, path)
+    _prefs_cache = dict(prefs)
+    try:
+        st = path.stat()
+        _prefs_cache_key = (str(path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        _prefs_cache_key = None
 
 
 def reset_all_preferences() -> None:
@@ -410,12 +463,47 @@ def set_default_filters(filters: dict[str, Any]) -> None:
 
 LOTRO_FOLDER_NAME = "The Lord of the Rings Online"
 
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
 
+    class _GUID(ctypes.Structure):
+        _fields_ = [
+            ("Data1", wintypes.DWORD),
+            ("Data2", wintypes.WORD),
+            ("Data3", wintypes.WORD),
+            ("Data4", wintypes.BYTE * 8),
+        ]
+
+    # FOLDERID_Documents
+    _FOLDERID_DOCUMENTS = _GUID(
+        0xFDD39AD0,
+        0x238F,
+        0x46AF,
+        (ctypes.c_byte * 8)(0xAD, 0xB4, 0x6C, 0x85, 0x48, 0x03, 0x69, 0xC7),
+    )
+
+    _SHELL32 = ctypes.windll.shell32  # type: ignore[attr-defined]
+    _OLE32 = ctypes.windll.ole32  # type: ignore[attr-defined]
+    # Declared signatures let ctypes marshal directly instead of guessing per call.
+    _SHELL32.SHGetKnownFolderPath.argtypes = [
+        ctypes.POINTER(_GUID),
+        wintypes.DWORD,
+        wintypes.HANDLE,
+        ctypes.POINTER(ctypes.c_wchar_p),
+    ]
+    _SHELL32.SHGetKnownFolderPath.restype = ctypes.c_long  # HRESULT
+    _OLE32.CoTaskMemFree.argtypes = [ctypes.c_void_p]
+    _OLE32.CoTaskMemFree.restype = None
+
+
+@functools.lru_cache(maxsize=1)
 def _get_documents_library_path() -> str:
     """
     Return the system's Documents library path. On Windows uses the Known Folders API
     (FOLDERID_Documents) so the actual Documents library location is used, not a guessed path.
-    Returns empty string on failure or non-Windows.
+    Returns empty string on failure or non-Windows. Cached: the answer is fixed for
+    the process lifetime and the Windows path costs a COM round-trip per call.
     """
     if sys.platform != "win32":
         try:
@@ -427,36 +515,17 @@ def _get_documents_library_path() -> str:
         return ""
 
     try:
-        import ctypes
-        from ctypes import wintypes
-
-        class GUID(ctypes.Structure):
-            _fields_ = [
-                ("Data1", wintypes.DWORD),
-                ("Data2", wintypes.WORD),
-                ("Data3", wintypes.WORD),
-                ("Data4", wintypes.BYTE * 8),
-            ]
-
-        # FOLDERID_Documents
-        FOLDERID_DOCUMENTS = GUID(
-            0xFDD39AD0,
-            0x238F,
-            0x46AF,
-            (ctypes.c_byte * 8)(0xAD, 0xB4, 0x6C, 0x85, 0x48, 0x03, 0x69, 0xC7),
-        )
-        shell32 = ctypes.windll.shell32  # type: ignore[attr-defined]
-        path_buf = ctypes.c_void_p()
-        hr = shell32.SHGetKnownFolderPath(
-            ctypes.byref(FOLDERID_DOCUMENTS),
+        path_buf = ctypes.c_wchar_p()
+        hr = _SHELL32.SHGetKnownFolderPath(
+            ctypes.byref(_FOLDERID_DOCUMENTS),
             0,
             None,
             ctypes.byref(path_buf),
         )
         if hr != 0 or not path_buf.value:
             raise OSError("SHGetKnownFolderPath failed")
-        path = ctypes.wstring_at(path_buf.value)
-        ctypes.windll.ole32.CoTaskMemFree(path_buf.value)  # type: ignore[attr-defined]
+        path = path_buf.value
+        _OLE32.CoTaskMemFree(path_buf)
         if path and Path(path).exists():
             return path
     except Exception:
@@ -471,12 +540,15 @@ def _get_documents_library_path() -> str:
     return ""
 
 
+@functools.lru_cache(maxsize=1)
 def get_default_lotro_root() -> str:
     """
     Return the default Lord of the Rings Online directory path if it exists.
     Uses the system's Documents library (on Windows, the actual Documents known folder),
     then looks for the LOTRO folder within it. Tries "The Lord of the Rings Online"
     then "Lord of the Rings Online". Returns empty string if no default location is found.
+    Cached per process; get_lotro_root falls back here on every call while no
+    root is saved. Tests can reset via get_default_lotro_root.cache_clear().
     """
     docs = _get_documents_library_path()
     if not docs:
@@ -526,16 +598,22 @@ def ensure_default_lotro_root() -> None:
         set_lotro_root(default)
 
 
+@functools.lru_cache(maxsize=4)
+def _resolved_music_root(lotro: str) -> str:
+    """Resolve lotro_root/Music once per distinct root; resolve() walks the
+    filesystem and get_music_root is called per file in scans and exports."""
+    try:
+        return str((Path(lotro) / "Music").resolve())
+    except (OSError, RuntimeError):
+        return ""
+
+
 def get_music_root() -> str:
     """Return the root Music folder path (lotro_root/Music). Empty if lotro_root not set."""
     lotro = get_lotro_root()
     if not lotro:
         return ""
-    try:
-        music = Path(lotro) / "Music"
-        return str(music.resolve())
-    except (OSError, RuntimeError):
-        return ""
+    return _resolved_music_root(lotro)
 
 
 def get_set_export_dir_stored() -> str:
@@ -580,7 +658,7 @@ def set_set_export_dir(path: str) -> None:
         music = get_music_root()
         if music:
             full = Path(path).resolve()
-            music_p = Path(music).resolve()
+            music_p = Path(music)  # get_music_root already resolves
             try:
                 rel = full.relative_to(music_p)
                 prefs["set_export_dir"] = rel.as_posix()
@@ -647,8 +725,16 @@ def to_music_relative(path: str) -> str:
         music = get_music_root()
         if not music:
             return path
+        # Fast path: an absolute path that string-prefixes the resolved Music
+        # root needs no stat calls at all. normpath strips ".." segments, so
+        # the prefix compare is trustworthy; anything else (relative input,
+        # symlinked spellings) falls through to the full resolve.
+        prefix = music + os.sep
+        norm = os.path.normpath(path)
+        if os.path.isabs(norm) and norm.startswith(prefix):
+            return norm[len(prefix):].replace(os.sep, "/")
         full = Path(path).resolve()
-        music_p = Path(music).resolve()
+        music_p = Path(music)  # get_music_root already resolves
         return full.relative_to(music_p).as_posix()
     except (ValueError, OSError, RuntimeError):
         return path
@@ -4,6 +4,7 @@ Library view: filterable table of songs, opens Song Detail on selection.
 
 from __future__ import annotations
 
+import functools
 import json
 from datetime import datetime, timezone
 from pathlib import Path
@@ -256,13 +257,24 @@ def _format_duration(sec: Optional[int]) -> str:
     return f"{m}:{s:02d}"
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_utc(iso: str) -> datetime:
+    """Parse a stored ISO timestamp to an aware UTC datetime, memoized per string.
+
+    Timestamps are stored as ISO TEXT (DATA_MODEL §1); the parse dominates the
+    last-played cell paint, so cache it and keep only the relative-delta live.
+    """
+    dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
 def _format_last_played(iso: Optional[str]) -> str:
     if not iso:
         return "—"
     try:
-        dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
+        dt = _parse_iso_utc(iso)
         now = datetime.now(timezone.utc)
         delta = now - dt
         if delta.days > 365:
@@ -280,10 +292,12 @@ def _format_last_played(iso: Optional[str]) -> str:
         return iso or "—"
 
 
-def _part_names_from_json(parts_json: Optional[str]) -> list[str]:
-    """Return list of part display names (part_name or 'Part N') from Song.parts JSON."""
+@functools.lru_cache(maxsize=1024)
+def _part_names_from_json(parts_json: Optional[str]) -> tuple[str, ...]:
+    """Return part display names (part_name or 'Part N') from Song.parts JSON.
+    Cached on the JSON text: tooltips re-request the same payload on every hover."""
     if not parts_json:
-        return []
+        return ()
     try:
         parts = json.loads(parts_json)
         out = []
@@ -292,9 +306,9 @@ def _part_names_from_json(parts_json: Optional[str]) -> list[str]:
             if not name:
                 name = f"Part {p.get('part_number', len(out) + 1)}"
             out.append(name)
-        return out
+        return tuple(out)
     except (json.JSONDecodeError, TypeError):
-        return []
+        return ()
 
 
 # Custom data roles for delegate and sorting
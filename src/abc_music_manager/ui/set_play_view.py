@@ -59,7 +59,7 @@ from ..db.setlist_repo import (
     list_setlist_items_with_song_meta,
 )
 from .setlist_picker_combo import SetlistPickerCombo
-from ..db.play_log import log_play, log_play_at
+from ..db.play_log import log_play, log_play_at, log_plays_bulk
 from .band_layout_grid import BandLayoutGridWidget, LayoutCard
 from .set_play_layout import (
     build_set_play_layout_cards,
@@ -784,13 +784,10 @@ class SetPlayView(QWidget):
             return
         qdt = dt.dateTime().toUTC()
         iso = qdt.toString("yyyy-MM-ddTHH:mm:ss.zzzZ")
-        for r in to_mark:
-            log_play_at(
-                self.app_state.conn,
-                r.item.song_id,
-                iso,
-                context_setlist_id=self._setlist.id,
-            )
+        log_plays_bulk(
+            self.app_state.conn,
+            [(r.item.song_id, iso, self._setlist.id, None) for r in to_mark],
+        )
         for r in to_mark:
             self._session.played_item_ids.add(r.item.id)
         self._session.revision += 1
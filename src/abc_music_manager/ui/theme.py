@@ -3,6 +3,7 @@ Dark theme (DECISIONS 025). In-code palette and QSS for PySide6.
 Used when Status.color or other UI elements are NULL (DECISIONS 018).
 """
 
+import functools
 from pathlib import Path
 
 from PySide6.QtCore import QObject, QEvent
@@ -45,8 +46,10 @@ STATUS_BADGE_TESTING = "#c9a227"
 STATUS_BADGE_READY = "#2d4a2d"
 
 
+@functools.lru_cache(maxsize=1)
 def dark_palette() -> QPalette:
-    """Build QPalette for dark theme."""
+    """Build QPalette for dark theme. Cached: the palette is constant and QPalette
+    is a Qt value type, so setPalette takes its own copy of the shared instance."""
     p = QPalette()
     p.setColor(QPalette.ColorRole.Window, QColor(COLOR_BACKGROUND))
     p.setColor(QPalette.ColorRole.WindowText, QColor(COLOR_ON_SURFACE))
@@ -63,8 +66,10 @@ def dark_palette() -> QPalette:
     return p
 
 
+@functools.lru_cache(maxsize=1)
 def dark_stylesheet() -> str:
-    """QSS for main window, menus, buttons, tables, inputs."""
+    """QSS for main window, menus, buttons, tables, inputs. Cached: the QSS is a
+    constant, and re-applying the theme otherwise re-renders this whole f-string."""
     return f"""
         QMainWindow, QWidget {{
             background-color: {COLOR_BACKGROUND};
@@ -516,6 +521,12 @@ _SPINBOX_STYLESHEET = (
 )
 
 
+# Shared QColor instances for _apply_spinbox_theme; the event filter styles
+# every spin box the first time it is shown, so avoid two allocations each.
+_SPINBOX_BASE_COLOR = QColor(COLOR_SURFACE)
+_SPINBOX_TEXT_COLOR = QColor(COLOR_ON_SURFACE)
+
+
 def _apply_spinbox_theme(spinbox: QSpinBox) -> None:
     """Force spin box and its line edit to match text box styling (background, font color)."""
     if spinbox.property("_theme_styled"):
@@ -525,8 +536,8 @@ def _apply_spinbox_theme(spinbox: QSpinBox) -> None:
     if le:
         le.setStyleSheet(_SPINBOX_LINEEDIT_STYLESHEET)
         p = le.palette()
-        p.setColor(p.ColorRole.Base, QColor(COLOR_SURFACE))
-        p.setColor(p.ColorRole.Text, QColor(COLOR_ON_SURFACE))
+        p.setColor(p.ColorRole.Base, _SPINBOX_BASE_COLOR)
+        p.setColor(p.ColorRole.Text, _SPINBOX_TEXT_COLOR)
         le.setPalette(p)
     spinbox.setProperty("_theme_styled", True)
 
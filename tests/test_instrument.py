@@ -0,0 +1,54 @@
+"""Unit tests for instrument resolution (name, case, aliases)."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from abc_music_manager.db.schema import create_schema
+from abc_music_manager.db.instrument import resolve_instrument_id
+
+
+def _make_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    return conn
+
+
+def test_resolve_exact_and_case_insensitive() -> None:
+    conn = _make_conn()
+    conn.execute(
+        "INSERT INTO Instrument (name, alternative_names, created_at, updated_at) VALUES (?, NULL, datetime('now'), datetime('now'))",
+        ("Basic Flute",),
+    )
+    conn.commit()
+    iid = resolve_instrument_id(conn, "Basic Flute")
+    assert resolve_instrument_id(conn, "basic flute") == iid
+    conn.close()
+
+
+def test_resolve_by_alias() -> None:
+    conn = _make_conn()
+    cur = conn.execute(
+        "INSERT INTO Instrument (name, alternative_names, created_at, updated_at) VALUES (?, ?, datetime('now'), datetime('now'))",
+        ("Basic Flute", "Flute, flauto"),
+    )
+    iid = cur.lastrowid
+    conn.execute(
+        "INSERT INTO InstrumentAlias (name_lower, instrument_id) VALUES (?, ?)", ("flute", iid)
+    )
+    conn.execute(
+        "INSERT INTO InstrumentAlias (name_lower, instrument_id) VALUES (?, ?)", ("flauto", iid)
+    )
+    conn.commit()
+    assert resolve_instrument_id(conn, "Flute") == iid
+    assert resolve_instrument_id(conn, "FLAUTO") == iid
+    conn.close()
+
+
+def test_resolve_creates_when_missing() -> None:
+    conn = _make_conn()
+    iid = resolve_instrument_id(conn, "Brand New Instrument")
+    assert resolve_instrument_id(conn, "Brand New Instrument") == iid
+    conn.close()
@@ -0,0 +1,37 @@
+"""iter_abc_files walker: symlinked directories are not followed (rglob parity)."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from abc_music_manager.scanning.scanner import iter_abc_files
+
+
+def _symlink_or_skip(target: Path, link: Path) -> None:
+    try:
+        os.symlink(target, link, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported on this platform")
+
+
+def test_iter_abc_files_does_not_follow_dir_symlinks(tmp_path: Path) -> None:
+    real = tmp_path / "real"
+    real.mkdir()
+    (real / "tune.abc").write_text("X:1\n")
+    _symlink_or_skip(real, tmp_path / "link")
+    found = sorted(iter_abc_files(str(tmp_path)))
+    # One discovery via the real path; the symlinked directory is not walked.
+    assert found == [str(real / "tune.abc")]
+
+
+def test_iter_abc_files_symlink_cycle_terminates(tmp_path: Path) -> None:
+    a = tmp_path / "a"
+    a.mkdir()
+    (a / "tune.abc").write_text("X:1\n")
+    _symlink_or_skip(a, a / "loop")
+    found = list(iter_abc_files(str(tmp_path)))
+    assert found == [str(a / "tune.abc")]
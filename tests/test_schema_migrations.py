@@ -0,0 +1,136 @@
+"""Upgrade tests: open an old-version database through init_database."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from abc_music_manager.db.schema import CURRENT_SCHEMA_VERSION, init_database
+
+
+def _create_v12_db(db_path: Path) -> None:
+    """
+    Build a schema-version-12 database by hand: the table shapes migrations 13+
+    expect to find (Song without part_count or the generated lowercase columns,
+    band tables without ON DELETE CASCADE, no SongPart/InstrumentAlias).
+    """
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE Song (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            composers TEXT NOT NULL,
+            duration_seconds INTEGER,
+            transcriber TEXT,
+            rating INTEGER,
+            status_id INTEGER REFERENCES Status(id),
+            notes TEXT,
+            lyrics TEXT,
+            last_played_at TEXT,
+            total_plays INTEGER NOT NULL DEFAULT 0,
+            parts TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            last_band_layout_id INTEGER REFERENCES BandLayout(id),
+            last_song_layout_id INTEGER REFERENCES SongLayout(id),
+            last_setlist_item_id INTEGER REFERENCES SetlistItem(id)
+        );
+        CREATE TABLE Band (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            notes TEXT,
+            sort_order INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE Player (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            level INTEGER,
+            class TEXT
+        );
+        CREATE TABLE BandMember (
+            band_id INTEGER NOT NULL REFERENCES Band(id),
+            player_id INTEGER NOT NULL REFERENCES Player(id),
+            PRIMARY KEY (band_id, player_id)
+        );
+        CREATE TABLE BandLayout (
+            id INTEGER PRIMARY KEY,
+            band_id INTEGER NOT NULL REFERENCES Band(id),
+            name TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            export_column_order TEXT,
+            sort_order INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE BandLayoutSlot (
+            id INTEGER PRIMARY KEY,
+            band_layout_id INTEGER NOT NULL REFERENCES BandLayout(id),
+            player_id INTEGER NOT NULL REFERENCES Player(id),
+            x INTEGER NOT NULL,
+            y INTEGER NOT NULL,
+            width_units INTEGER NOT NULL DEFAULT 7,
+            height_units INTEGER NOT NULL DEFAULT 5,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE TABLE schema_version (version INTEGER PRIMARY KEY);
+        INSERT INTO schema_version (version) VALUES (12);
+
+        INSERT INTO Song (title, composers, duration_seconds, parts, created_at, updated_at)
+        VALUES ('Old Song', 'Composer A', 120,
+                '[{"part_number":1,"part_name":"P1","instrument_id":null},'
+                || '{"part_number":2,"part_name":"P2","instrument_id":null}]',
+                datetime('now'), datetime('now'));
+        INSERT INTO Band (name, created_at, updated_at)
+        VALUES ('Old Band', datetime('now'), datetime('now'));
+        INSERT INTO Player (name, created_at, updated_at)
+        VALUES ('Old Player', datetime('now'), datetime('now'));
+        INSERT INTO BandMember (band_id, player_id) VALUES (1, 1);
+        INSERT INTO BandLayout (band_id, name, created_at, updated_at)
+        VALUES (1, 'Main', datetime('now'), datetime('now'));
+        INSERT INTO BandLayoutSlot (band_layout_id, player_id, x, y, created_at, updated_at)
+        VALUES (1, 1, 0, 0, datetime('now'), datetime('now'));
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_init_database_upgrades_v12(tmp_path: Path) -> None:
+    db_path = tmp_path / "abc_music_manager.sqlite"
+    _create_v12_db(db_path)
+    conn = init_database(db_path)
+    try:
+        version = conn.execute("SELECT version FROM schema_version").fetchone()[0]
+        assert version == CURRENT_SCHEMA_VERSION
+        # Migration 14 backfilled part_count; migration 17 normalized parts.
+        assert conn.execute("SELECT part_count FROM Song").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM SongPart").fetchone()[0] == 2
+        # idx_song_logical covers part_count, so it must exist only after migration 14.
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_song_logical'"
+        ).fetchone()
+        assert row is not None
+        # Migration 20 dropped idx_song_title_lower (unusable by the substring filters).
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_song_title_lower'"
+        ).fetchone()
+        assert row is None
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        # Migration 16 rebuilt the band tables with cascades and kept their rows.
+        band_member_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'BandMember'"
+        ).fetchone()[0]
+        assert "ON DELETE CASCADE" in band_member_sql
+        assert conn.execute("SELECT COUNT(*) FROM BandLayoutSlot").fetchone()[0] == 1
+        # Enforcement is back on after the rebuild, and deleting the band cascades.
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        with conn:
+            conn.execute("DELETE FROM Band")
+        assert conn.execute("SELECT COUNT(*) FROM BandMember").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM BandLayoutSlot").fetchone()[0] == 0
+    finally:
+        conn.close()
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
 
 from abc_music_manager.db.schema import create_schema, seed_defaults
-from abc_music_manager.db.song_repo import logical_identity, find_song_by_logical_identity
+from abc_music_manager.db.song_repo import ensure_song_from_parsed, logical_identity, find_song_by_logical_identity
 from abc_music_manager.parsing.abc_parser import ParsedSong, PartInfo
 
 
@@ -45,7 +45,36 @@ def test_find_song_by_logical_identity_match() -> None:
            VALUES (?, ?, ?, ?, NULL, NULL, NULL, NULL, NULL, 0, ?, datetime('now'), datetime('now'))""",
         ("My Title", "Composer A", 120, None, '[{"part_number":1,"part_name":"P1","instrument_id":1},{"part_number":2,"part_name":"P2","instrument_id":null}]'),
     )
+    song_id = conn.execute("SELECT id FROM Song").fetchone()[0]
+    # Normalized part rows; triggers keep Song.part_count in sync.
+    conn.executemany(
+        "INSERT INTO SongPart (song_id, part_number, part_name, instrument_id) VALUES (?, ?, ?, ?)",
+        [(song_id, 1, "P1", None), (song_id, 2, "P2", None)],
+    )
     conn.commit()
     ids = find_song_by_logical_identity(conn, "my title", "Composer A", 2)
     assert len(ids) == 1
     conn.close()
+
+
+def test_ensure_song_from_parsed_skips_noop_rescan() -> None:
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    seed_defaults(conn)
+    parsed = ParsedSong(
+        title="Rescan Song",
+        composers="Composer A",
+        duration_seconds=90,
+        transcriber=None,
+        export_timestamp=None,
+        parts=[PartInfo(1, "P1", None)],
+    )
+    song_id = ensure_song_from_parsed(conn, parsed, "/music/rescan.abc", file_mtime="100", file_hash="h1")
+    before = conn.execute("SELECT updated_at FROM Song WHERE id = ?", (song_id,)).fetchone()[0]
+    # Identical rescan: no UPDATE should run, so updated_at stays put.
+    assert ensure_song_from_parsed(conn, parsed, "/music/rescan.abc", file_mtime="100", file_hash="h1") == song_id
+    assert conn.execute("SELECT updated_at FROM Song WHERE id = ?", (song_id,)).fetchone()[0] == before
+    # A changed file hash still writes through.
+    ensure_song_from_parsed(conn, parsed, "/music/rescan.abc", file_mtime="101", file_hash="h2")
+    assert conn.execute("SELECT file_hash FROM SongFile WHERE song_id = ?", (song_id,)).fetchone()[0] == "h2"
+    conn.close()